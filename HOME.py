@@ -23,6 +23,10 @@ with col2:
             st.switch_page("pages/5_정시 전형 대학 찾기.py")
         if st.button("특별 전형 대학 찾기", use_container_width=True):
             st.switch_page("pages/6_특별 전형 대학 찾기.py")
+        if st.button("전체 전형 대학 찾기", use_container_width=True):
+            st.switch_page("pages/7_전체 전형 대학 찾기.py")
+        if st.button("일괄 추천 받기", use_container_width=True):
+            st.switch_page("pages/8_일괄 추천 받기.py")
         
 st.markdown("""
 <div style='text-align: center; margin-top: 50px;'>
@@ -0,0 +1,104 @@
+"""utils.api 검색 API 에 동시 요청을 보내 처리량과 지연 시간(p50/p95/p99)을 잰다.
+
+    python -m benchmarks.bench_api                                   # 같은 프로세스에 서버를 띄워서
+    python -m benchmarks.bench_api --url http://127.0.0.1:8000 --clients 16 --requests 2000
+    python -m benchmarks.bench_api --batch 20                        # 요청마다 질의 20개씩
+
+질의는 bench_search 와 같은 전공·점수 조합을 돌려 쓰므로 두 번째 바퀴부터는 결과 캐시에 걸린다.
+--cold 를 주면 점수에 작은 난수를 더해 캐시에 덜 걸리게 한다.
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import make_server
+
+from benchmarks.bench_search import GRADES, MAJORS, OPTIONS, PERCENTILES
+from utils.admissions import TRACKS, warm_up
+from utils.api import create_app
+
+
+def make_queries(n, cold=False, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for i in range(n):
+        track = list(TRACKS)[i % len(TRACKS)]
+        config = TRACKS[track]
+        scores = PERCENTILES if config["higher_is_better"] else GRADES
+        score = scores[(i // len(TRACKS)) % len(scores)]
+        if cold:
+            low, high = config["score_range"]
+            score = min(high, max(low, score + rng.uniform(-1, 1) * config["window"]))
+        query = {"track": track, "major": MAJORS[(i * 7) % len(MAJORS)], "score": round(score, 2)}
+        if config["filters"]:
+            query["eligibility"] = [OPTIONS[i % len(OPTIONS)]]
+        queries.append(query)
+    return queries
+
+
+def post(url, payload, token=None):
+    request = urllib.request.Request(f"{url}/search", data=json.dumps(payload).encode(), method="POST",
+                                     headers={"Content-Type": "application/json"})
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        size = len(response.read())
+    return (time.perf_counter() - start) * 1000, size
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(url, clients, requests, batch, cold, token=None):
+    queries = make_queries(requests * batch, cold)
+    payloads = [queries[i:i + batch] for i in range(0, len(queries), batch)]
+    payloads = [{"queries": chunk} if batch > 1 else chunk[0] for chunk in payloads]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda payload: post(url, payload, token), payloads))
+    elapsed = time.perf_counter() - start
+
+    times = [ms for ms, _ in results]
+    print(f"{requests} requests x {batch} queries, {clients} clients: {requests / elapsed:.0f} req/s, "
+          f"{requests * batch / elapsed:.0f} queries/s")
+    print(f"latency ms  p50 {statistics.median(times):.1f}  p95 {_percentile(times, 0.95):.1f}  "
+          f"p99 {_percentile(times, 0.99):.1f}  max {max(times):.1f}  avg body {statistics.mean(s for _, s in results) / 1024:.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소. 없으면 같은 프로세스에 서버를 띄운다")
+    parser.add_argument("--token")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--cold", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        warm_up()
+        server = make_server("127.0.0.1", 0, create_app(log_requests=False, token=args.token), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        run(url.rstrip("/"), args.clients, args.requests, args.batch, args.cold, args.token)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import re
+import statistics
+import time
+
+import numpy as np
+
+from utils.data import DATASETS, load_results
+from utils.major_index import load_index
+from utils.matcher import MajorMatcher, load_matcher
+
+QUERIES = ['컴퓨터공학', '화학', '물리', '생명과학', '역사', '경영', '간호', '수학', '심리학', '기계공학', '국어국문', '체육']
+# (입력, 기대하는 교정 결과): 줄임말과 오타
+TYPOS = [('컴공', '컴퓨터공학'), ('컴퓨타공학', '컴퓨터공학'), ('겅영', '경영'), ('기게공학', '기계공학'), ('건축공핛', '건축공학'),
+         ('식품영앙', '식품영양학'), ('생명과학자', '생명과학'), ('사복', '사회복지'), ('의대', '의예'), ('산디', '산업디자인')]
+
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def regex_path(df, patterns, major_input):
+    major_pattern = '|'.join(re.escape(m) for m in patterns)
+    mask = df['학과명'].str.contains(major_pattern, case=False, na=False)
+    priority = df.loc[mask, '학과명'].apply(lambda x: 0 if major_input.lower() in x.lower() else 1)
+    return mask.to_numpy(), priority.to_numpy()
+
+
+def matcher_path(matcher, df, patterns, major_input):
+    mask = matcher.contains(df['학과명'], patterns)
+    priority = matcher.priority(df.loc[mask, '학과명'], major_input)
+    return mask, priority
+
+
+def main(repeat=20):
+    index = load_index()
+    print(f"{'dataset':<18}{'rows':>7}{'majors':>8}{'build ms':>10}{'regex ms':>10}{'matcher ms':>12}{'speedup':>9}")
+    for name in DATASETS:
+        df = load_results(name)
+        start = time.perf_counter()
+        MajorMatcher(df['학과명'].cat.categories)
+        build_ms = (time.perf_counter() - start) * 1000
+        matcher = load_matcher(name)
+
+        regex_ms, matcher_ms = [], []
+        for query in QUERIES:
+            patterns = list(dict.fromkeys([query] + index.lookup(query)))
+            expected = regex_path(df, patterns, query)
+            actual = matcher_path(matcher, df, patterns, query)
+            assert np.array_equal(expected[0], actual[0]) and np.array_equal(expected[1], actual[1]), (name, query)
+            regex_ms.append(_median_ms(lambda: regex_path(df, patterns, query), repeat))
+            matcher_ms.append(_median_ms(lambda: matcher_path(matcher, df, patterns, query), repeat))
+
+        r, m = statistics.mean(regex_ms), statistics.mean(matcher_ms)
+        print(f"{name:<18}{len(df):>7}{len(matcher.lowered):>8}{build_ms:>10.1f}{r:>10.2f}{m:>12.2f}{r / m:>8.1f}x")
+
+    print(f"\n{'input':<12}{'corrected':<14}{'suggest ms':>12}")
+    for query, expected in TYPOS:
+        corrected = index.correct(query)
+        assert corrected == expected, (query, corrected)
+        print(f"{query:<12}{corrected:<14}{_median_ms(lambda: index.suggest(query), repeat):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
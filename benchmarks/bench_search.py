@@ -0,0 +1,198 @@
+"""지원 대학 검색 경로의 단계별 지연 시간(p50/p95)과 최대 메모리를 잰다.
+
+    python -m benchmarks.bench_search                      # 실제 데이터 (1배)
+    python -m benchmarks.bench_search --scales 1 10 100    # 대학명을 복제해 데이터를 10배, 100배로 늘려서
+    python -m benchmarks.bench_search --tracks 교과 정시 --repeat 5 --gpt-latency 0.3
+
+페이지(3~7)와 같은 admissions.find() 를 Streamlit 없이 실행한다. 데이터셋(배율별)은 data.replace_results 로 바꿔 끼우고,
+단계 시간은 find()/search() 가 trace 에 남기는 expand -> load -> filter -> rank -> history 에
+데이터 읽기(read), 색인 만들기(index), 표 렌더링(render)을 더해 보여준다.
+ask_gpt 는 오프라인 색인으로 답하는 결정적인 stub 으로 바꾸고(--gpt-latency 로 지연을 흉내 낼 수 있다),
+render 는 st.table 이 하는 것과 같은 Arrow 직렬화로 잰다. 질의마다 결과 캐시를 비우므로(--cached 를 주면 그대로 둔다)
+두 번째 바퀴부터는 관련 학과 캐시만 걸린다.
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from streamlit import dataframe_util
+
+from utils import majors
+from utils.admissions import FOUND, TRACKS, find, warm_up
+from utils.data import data_path, load_results, read_results, replace_results, snapshot_path
+from utils.llm_cache import LLMCache
+from utils.major_index import load_index
+from utils.result_cache import result_cache
+from utils.telemetry import Trace
+from utils import snapshot
+
+MAJORS = ['컴퓨터공학', '소프트웨어', '전자공학', '기계공학', '화학', '물리', '생명과학', '수학', '통계', '경영',
+          '경제', '심리학', '역사', '국어국문', '영어영문', '간호', '약학', '건축', '법학', '미디어']
+GRADES = [1.3, 2.0, 2.7, 3.5, 4.5]
+PERCENTILES = [72.0, 80.0, 86.0, 92.0, 97.0]
+OPTIONS = ['농어촌', '기초생활', '특성화고']
+
+STAGES = ['read', 'index', 'expand', 'load', 'filter', 'rank', 'history', 'render']
+
+
+def stub_ask_gpt(latency):
+    index = load_index()
+
+    def ask_gpt(prompt, api_key, timeout=None):
+        major = re.search(r"'(.+?)' 전공과 관련된", prompt).group(1)
+        if latency:
+            time.sleep(latency)
+        return ", ".join(f"{stem}과" for stem in index.lookup(major)) or f"{major}과"
+    return ask_gpt
+
+
+def scaled(df, factor, seed=0):
+    """대학명을 factor 벌 복제(대학명#2, #3 ...)하고 합격 점수를 조금씩 흔든 합성 데이터."""
+    if factor == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        if i:
+            copy['대학명'] = copy['대학명'].cat.rename_categories(lambda name: f"{name}#{i + 1}")
+            score_col = '합격 백분위' if '합격 백분위' in copy.columns else '합격 등급'
+            copy[score_col] = (copy[score_col] + rng.normal(0, 0.05, len(copy))).astype('float32')
+        copies.append(copy)
+    result = pd.concat(copies, ignore_index=True)
+    for col in ('대학명', '학과명', '전형유형', '전형명'):
+        if col in result.columns:
+            result[col] = result[col].astype('category')
+    return result
+
+
+class MemoryTrace(Trace):
+    """단계마다 tracemalloc 으로 최대 메모리 증가량도 재는 trace (로그는 남기지 않는다)."""
+
+    def __init__(self, page, peaks):
+        super().__init__(page)
+        self.peaks = peaks
+
+    @contextmanager
+    def stage(self, name):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            with super().stage(name):
+                yield
+        finally:
+            self.peaks[name] = max(self.peaks[name], tracemalloc.get_traced_memory()[1] - base)
+
+
+def run_query(track, major_input, score, option, api_key, trace, cached=False):
+    """find() 로 검색하고 결과 표(이력이 있으면 결과마다 이력 표)를 렌더링한다. 결과 수를 돌려준다."""
+    if not cached:
+        result_cache.clear()
+    filters = {'지원자격': [option]} if option and TRACKS[track]["filters"] else None
+    result = find(track, major_input, score, api_key, lookup="gpt", filters=filters, trace=trace)
+    if result.status != FOUND:
+        return 0
+
+    with trace.stage('render'):
+        if result.config["history_years"]:
+            history, offsets = result.history()
+            tables = [history.iloc[offsets[i]:offsets[i + 1]] for i in range(len(result.results))]
+        else:
+            tables = [result.table()]
+        for table in tables:
+            dataframe_util.convert_anything_to_arrow_bytes(table)
+    return len(result.results)
+
+
+def queries(track):
+    scores = PERCENTILES if TRACKS[track]["higher_is_better"] else GRADES
+    options = OPTIONS if TRACKS[track]["filters"] else [None]
+    for i, major in enumerate(MAJORS):
+        for j, score in enumerate(scores):
+            yield major, score, options[(i + j) % len(options)]
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def bench_track(track, factor, repeat, api_key, cached=False):
+    config = TRACKS[track]
+    name = config["dataset"]
+    times, peaks = defaultdict(list), defaultdict(int)
+    source = load_results(name)
+
+    def load(trace):
+        with trace.stage('read'):
+            if factor == 1:
+                df = snapshot.read_snapshot(snapshot_path(name), snapshot.file_hash(data_path(name)))
+                df = df if df is not None else read_results(data_path(name))
+            else:
+                df = scaled(source, factor)
+        # 배율별 데이터로 바꿔 끼우면 이전 색인은 버려지고 find() 가 이 데이터로 다시 만든다
+        replace_results(name, df)
+        result_cache.clear()
+        with trace.stage('index'):
+            warm_up([track])
+        return df
+
+    # read/index 는 배율마다 한 번씩만 잰다 (페이지에서는 프로세스당 한 번). 메모리는 tracemalloc 을 켠 별도 회차에서 잰다.
+    loading = Trace(track)
+    df = load(loading)
+    for stage, ms in loading.stages.items():
+        times[stage].append(ms)
+    per_query = []
+    for _ in range(repeat):
+        majors.major_cache = LLMCache(os.path.join(tempfile.mkdtemp(), "majors.sqlite3"))
+        for major, score, option in queries(track):
+            trace = Trace(track)
+            run_query(track, major, score, option, api_key, trace, cached)
+            for stage, ms in trace.stages.items():
+                times[stage].append(ms)
+            per_query.append(sum(trace.stages.values()))
+
+    tracemalloc.start()
+    df = load(MemoryTrace(track, peaks))
+    found = sum(run_query(track, major, score, option, api_key, MemoryTrace(track, peaks), cached)
+                for major, score, option in queries(track))
+    tracemalloc.stop()
+    replace_results(name, source)
+
+    n = len(list(queries(track)))
+    print(f"\n[{track}] {name} x{factor}: {len(df):,} rows, {n} queries x {repeat}, avg {found / n:.1f} results")
+    print(f"{'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'peak MB':>10}")
+    for stage in STAGES:
+        if not times.get(stage):
+            continue
+        print(f"{stage:<10}{statistics.median(times[stage]):>10.2f}{_percentile(times[stage], 0.95):>10.2f}"
+              f"{peaks[stage] / 2 ** 20:>10.1f}")
+    print(f"{'query':<10}{statistics.median(per_query):>10.2f}{_percentile(per_query, 0.95):>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1])
+    parser.add_argument("--tracks", nargs="+", default=list(TRACKS), choices=list(TRACKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--gpt-latency", type=float, default=0.0)
+    parser.add_argument("--cached", action="store_true", help="질의마다 결과 캐시를 비우지 않는다")
+    args = parser.parse_args()
+
+    majors.ask_gpt = stub_ask_gpt(args.gpt_latency)
+    majors.major_cache = LLMCache(os.path.join(tempfile.mkdtemp(), "majors.sqlite3"))
+    for factor in args.scales:
+        for track in args.tracks:
+            bench_track(track, factor, args.repeat, api_key="stub", cached=args.cached)
+
+
+if __name__ == '__main__':
+    main()
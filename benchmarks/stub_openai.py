@@ -0,0 +1,145 @@
+"""OpenAI chat completions API 를 흉내 내는 로컬 HTTP 서버.
+
+    python -m benchmarks.stub_openai --port 8765 --latency 0.2 --fail-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run HOME.py
+
+실제 API 키 없이 utils.llm 의 연결 재사용, 재시도, 동시성 제한을 확인하거나 부하 테스트를 할 때 쓴다.
+--fail-rate 비율만큼 429/500 을 섞어 돌려준다. stream=true 요청에는 SSE 로 조각내어 보낸다.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = (
+    "1. 가상의 탐구 주제\n"
+    "- 핵심 개념: 로컬 stub 서버가 돌려준 응답입니다.\n"
+    "- 탐구 방법: 실제 API 대신 고정된 문장을 반환합니다.\n"
+)
+MAJORS_REPLY = "컴퓨터공학과, 소프트웨어학과, 인공지능학과, 전자공학과, 정보통신공학과"
+
+
+class StubState:
+
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.active = 0
+        self.peak_active = 0
+
+
+def _reply_for(messages):
+    prompt = messages[-1]["content"] if messages else ""
+    return MAJORS_REPLY if "학과명" in prompt else REPLY
+
+
+def make_handler(state):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _json(self, status, body, headers=()):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with state.lock:
+                state.requests += 1
+                state.active += 1
+                state.peak_active = max(state.peak_active, state.active)
+                fail = state.random.random() < state.fail_rate
+                if fail:
+                    state.failures += 1
+            try:
+                time.sleep(state.latency)
+                if not self.path.endswith("/chat/completions"):
+                    self._json(404, {"error": {"message": "not found"}})
+                elif fail:
+                    status = state.random.choice((429, 500))
+                    self._json(status, {"error": {"message": f"stub error {status}"}}, [("retry-after", "0")])
+                elif body.get("stream"):
+                    self._stream(body)
+                else:
+                    self._complete(body)
+            finally:
+                with state.lock:
+                    state.active -= 1
+
+        def _usage(self, messages, text):
+            prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 2
+            completion_tokens = len(text) // 2
+            return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens}
+
+        def _complete(self, body):
+            text = _reply_for(body.get("messages", []))
+            self._json(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": self._usage(body.get("messages", []), text),
+            })
+
+        def _stream(self, body):
+            text = _reply_for(body.get("messages", []))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def send(payload):
+                data = f"data: {payload}\n\n".encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+            base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": body.get("model", "stub")}
+            for i in range(0, len(text), 8):
+                delta = {"content": text[i:i + 8]}
+                send(json.dumps({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]},
+                                ensure_ascii=False))
+            if body.get("stream_options", {}).get("include_usage"):
+                send(json.dumps({**base, "choices": [], "usage": self._usage(body.get("messages", []), text)}))
+            send("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def serve(port=8765, latency=0.0, fail_rate=0.0, seed=0):
+    """백그라운드 스레드로 stub 서버를 띄우고 (server, state) 를 반환한다. port=0 이면 빈 포트를 쓴다."""
+    state = StubState(latency, fail_rate, seed)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server, _ = serve(args.port, args.latency, args.fail_rate)
+    print(f"stub OpenAI API on http://127.0.0.1:{server.server_port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
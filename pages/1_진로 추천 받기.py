@@ -1,7 +1,13 @@
-from openai import OpenAI
 import streamlit as st
 
+from utils.chat_context import ChatContext
+from utils.llm import stream_chat, submit_gpt
+from utils.telemetry import Trace
+
 API_KEY = st.secrets["openai_api_key"]
+SHOW_METRICS = st.secrets.get("show_chat_metrics", False)
+CONTEXT_TOKEN_BUDGET = st.secrets.get("chat_token_budget", 6000)
+LOG_REQUESTS = st.secrets.get("log_requests", False)
 
 st.set_page_config(
     page_title="HighAI",
@@ -14,12 +20,14 @@ st.caption("😀 **사용 방법:** 채팅창에 당신의 **관심사**, **성
 if "messages" not in st.session_state:
     st.session_state["messages"] = [{"role": "assistant", "content": "안녕하세요! 저는 고등학생 여러분의 진로 고민을 함께 나누고, 여러분의 꿈을 찾아가는 데 도움을 드리는 진로 상담 챗봇입니다."}]
 
+if "chat_context" not in st.session_state:
+    st.session_state["chat_context"] = ChatContext(lambda p: submit_gpt(p, API_KEY), token_budget=CONTEXT_TOKEN_BUDGET)
+
 for msg in st.session_state.messages:
     st.chat_message(msg["role"]).write(msg["content"])
 
 if prompt := st.chat_input("여기에 질문을 입력해주세요."): 
 
-    client = OpenAI(api_key=API_KEY)
     st.session_state.messages.append({"role": "user", "content": prompt})
     st.chat_message("user").write(prompt)
     
@@ -35,12 +43,32 @@ if prompt := st.chat_input("여기에 질문을 입력해주세요."):
     * 항상 따뜻하고 친절한 말투를 유지하며, 하위목록을 자제하고 이모지를 적극적으로 활용하여 가독성을 높입니다.
     * 단계를 구분하여 순차적으로 정보를 제공하고, 다음 단계로 나아갈 수 있도록 유도 질문을 합니다.
     """
-    messages_with_system = [{"role": "system", "content": system_prompt}] + st.session_state.messages
-
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=messages_with_system
-    )
-    msg = response.choices[0].message.content
-    st.session_state.messages.append({"role": "assistant", "content": msg})
-    st.chat_message("assistant").write(msg)
\ No newline at end of file
+    context = st.session_state.chat_context
+    messages_with_system = context.build(system_prompt, st.session_state.messages)
+    stats = {"context_tokens": context.context_tokens(system_prompt)}
+
+    received = []
+
+    def remember(tokens):
+        for token in tokens:
+            received.append(token)
+            yield token
+
+    with Trace("진로", LOG_REQUESTS, turn=len(st.session_state.messages) // 2, context_tokens=stats["context_tokens"]) as trace:
+        tokens = stream_chat(messages_with_system, API_KEY, stats)
+        try:
+            with st.chat_message("assistant"):
+                st.write_stream(remember(tokens))
+                if SHOW_METRICS and "ttft" in stats:
+                    st.caption(f"첫 토큰 {stats['ttft']:.1f}초 · 전체 {stats['total_time']:.1f}초 · 토큰 {stats.get('total_tokens', '-')}개 (맥락 약 {stats['context_tokens']}개)")
+        finally:
+            tokens.close()
+            trace.record_llm(stats)
+            # 중간에 멈추거나 오류가 나도 대화 기록이 user/assistant 순서를 유지하도록 받은 만큼만 저장한다
+            if received:
+                st.session_state.messages.append({"role": "assistant", "content": "".join(received)})
+                st.session_state.setdefault("turn_stats", []).append(stats)
+                context.record_usage(st.session_state.messages, stats)
+                context.prefetch(system_prompt, st.session_state.messages)
+            else:
+                st.session_state.messages.pop()
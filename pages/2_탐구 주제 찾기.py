@@ -1,8 +1,13 @@
 import streamlit as st
-import re
-from openai import OpenAI
+
+from utils.llm import stream_chat
+from utils.telemetry import Trace
+from utils.topics import TOPIC_PROMPT, TopicParser, cached_topics, store_topics, topic_cache, topic_key
 
 API_KEY = st.secrets["openai_api_key"]
+REUSE_TOPICS = st.secrets.get("reuse_topics", True)
+SHOW_METRICS = st.secrets.get("show_cache_metrics", False)
+LOG_REQUESTS = st.secrets.get("log_requests", False)
 
 st.set_page_config(
     page_title="HighAI",
@@ -10,18 +15,54 @@ st.set_page_config(
     layout="centered"
 )
 
-def ask_gpt(prompt, api_key):
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content
-
-def gpt_response(response):
-    pattern = r"\d+\.\s\*\*(.+?)\*\*\n\s*-\s*핵심 개념:\s*(.+?)\n\s*-\s*탐구 방법:\s*(.+?)(?=\n\d+\.|\Z)"
-    matches = re.findall(pattern, response, re.DOTALL)
-    return matches
+def show_topic(idx, topic):
+    title, concept, approach = topic
+    with st.expander(f"📃` ` {idx}. {title}"):
+        st.markdown(f"**📌 핵심 개념:** {concept}")
+        st.markdown(f"**🔬 탐구 방법:** {approach}")
+
+def regenerate():
+    st.session_state["topic_regenerate"] = True
+
+def generate(key, subject, topic, grade, method, trace):
+    with st.spinner("탐구 주제를 추천하고 있어요..."):
+        prompt = TOPIC_PROMPT.format(subject=subject, topic=topic, grade=grade, method=method)
+
+        parser = TopicParser()
+        topics = []
+        error = None
+        stats = {}
+
+        def show(done):
+            for topic in done:
+                if not topics:
+                    st.markdown("---")
+                topics.append(topic)
+                show_topic(len(topics), topic)
+
+        try:
+            with trace.stage("llm"):
+                for chunk in stream_chat([{"role": "user", "content": prompt}], API_KEY, stats):
+                    show(parser.feed(chunk))
+        except Exception as e:
+            if not parser.text:
+                raise
+            error = e
+        finally:
+            trace.record_llm(stats)
+        show(parser.close())
+        trace.set(topics=len(topics), truncated=error is not None)
+
+        if topics:
+            if error is not None:
+                st.warning("응답이 중간에 끊겨 받은 주제까지만 보여드립니다.")
+            else:
+                trace.set(stored=store_topics(key, topics))
+        elif parser.text.strip():
+            st.warning("답변 형식을 인식하지 못해 받은 내용을 그대로 보여드립니다.")
+            st.markdown(parser.text)
+        else:
+            st.error("입력을 바꿔 다시 시도해 주세요.")
 
 def main():
     st.header("💬 탐구 주제 찾기")
@@ -39,45 +80,35 @@ def main():
         if not subject or not topic:
             st.warning("❗ 교과목과 주제를 모두 입력해 주세요.")
             return
-
-        with st.spinner("탐구 주제를 추천하고 있어요..."):
-            prompt = f"""
-당신은 진로진학 전문 고등학교 교사입니다. 학생이 입력한 교과목과 주제, 학년, 선호 탐구 방법에 기반하여, **대학 전공 수준의 심화 탐구 주제 10가지를 구체적으로 제시해주세요.**
-
-각 주제는 다음의 3가지 구성요소를 포함해야 합니다:
-
-1. **주제명** (문장형 제목)
-2. **핵심 개념**: 해당 주제와 관련된 교과 개념 및 전공 개념
-3. **탐구 방법**: 학생의 선호 탐구 방식{method}에 맞추어, 탐구의 구체적인 실행 절차를 친절하고 상세하게 안내해주세요.
-
-**학생 정보:**
-- 학년: {grade}학년
-- 좋아하는 교과목: {subject}
-- 좋아하는 주제(단원): {topic}
-- 선호하는 탐구 방법: {method}
-
-**답변 형식 예시:**
-1. **[주제명]**
-   - 핵심 개념: ...
-   - 탐구 방법: ...
-
-※ 현실적으로 수행 가능한 고등학생 수준의 탐구를 기반으로, 교육과정 및 대입 전형에서 활용 가능한 방식으로 제안해주세요.
-※ 고등학생들이 해당 탐구를 실제로 할 수 있도록 공식적인 학술 용어를 활용하고 구체적으로 이해하기 쉽게 설명해주세요.
-※ 핵심 개념은 5개 이상, 탐구 방법은 4문장 이상으로 내용을 구체적으로 설명해주세요.
-"""
-
-            output = ask_gpt(prompt, API_KEY)
-            parsed = gpt_response(output)
-
-            if parsed:
+        st.session_state["topic_query"] = (subject, topic, grade, method)
+        fresh = False
+    elif st.session_state.pop("topic_regenerate", False) and "topic_query" in st.session_state:
+        subject, topic, grade, method = st.session_state["topic_query"]
+        fresh = True
+    else:
+        return
+
+    # 같은 조건으로 추천한 적이 있으면 저장된 결과를 바로 보여주고, '새로 추천 받기'로 다시 생성한다
+    key = topic_key(subject, topic, grade, method)
+    with Trace("탐구", LOG_REQUESTS, fresh=fresh) as trace:
+        with trace.stage("cache"):
+            cached = cached_topics(key) if REUSE_TOPICS and not fresh else None
+        trace.set(cache_hit=bool(cached))
+        if cached:
+            with trace.stage("render"):
                 st.markdown("---")
-
-                for idx, (title, concept, method) in enumerate(parsed, 1):
-                    with st.expander(f"📃` ` {idx}. {title.strip()}"):
-                        st.markdown(f"**📌 핵심 개념:** {concept.strip()}")
-                        st.markdown(f"**🔬 탐구 방법:** {method.strip()}")
-            else:
-                st.error("입력을 바꿔 다시 시도해 주세요.")
+                for idx, cached_topic in enumerate(cached, 1):
+                    show_topic(idx, cached_topic)
+                st.caption("💾 같은 조건으로 추천했던 결과입니다.")
+        else:
+            if fresh:
+                topic_cache.record("refreshes")
+            generate(key, subject, topic, grade, method, trace)
+
+    if REUSE_TOPICS:
+        st.button("🔄 새로 추천 받기", on_click=regenerate)
+    if SHOW_METRICS:
+        st.caption(f"💾 캐시 적중률 {topic_cache.hit_rate():.0%} (적중 {topic_cache.stats['hits']}회 · 생성 {topic_cache.stats['misses']}회 · 새로 추천 {topic_cache.stats['refreshes']}회)")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,10 +1,17 @@
-from openai import OpenAI
 import streamlit as st
-import pandas as pd
-import numpy as np
-import re
+
+from utils.admissions import FOUND, NO_MAJOR, TRACKS, find, year_range
+from utils.telemetry import Trace
 
 API_KEY = st.secrets["openai_api_key"]
+MAJOR_LOOKUP = st.secrets.get("major_lookup", "index")
+MAJOR_GPT_FALLBACK = st.secrets.get("major_gpt_fallback", False)
+LOG_REQUESTS = st.secrets.get("log_requests", False)
+
+TRACK = "교과"
+SCORE_WINDOW = TRACKS[TRACK]["window"]
+MIN_SCORE, MAX_SCORE = TRACKS[TRACK]["score_range"]
+START_YEAR, YEAR = year_range(TRACK)
 
 st.set_page_config(
     page_title="HighAI",
@@ -15,21 +22,7 @@ st.set_page_config(
 st.header("💬 교과 전형 대학 찾기")
 st.caption("**✅ 사용방법 :** 희망 전공과 본인의 내신 등급을 입력하고 '지원 대학 검색' 버튼을 눌러주세요.  \n **⚠️ 주의사항 :** 검색 결과는 참고용이며, 반드시 담임 선생님과 상담하여 신중하게 결정하세요.")
 
-def ask_gpt(prompt, api_key):
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    gptResponse = response.choices[0].message.content
-    return gptResponse
-
 def main():
-    df = pd.read_csv("data/Early_Results1.csv")
-    df['합격 등급'] = pd.to_numeric(df['합격 등급'], errors='coerce')
-    df['년도'] = pd.to_numeric(df['년도'], errors='coerce')
-    df.dropna(subset=['합격 등급', '년도'], inplace=True)
-
     col1, col2 = st.columns(2)
     with col1:
         major_input = st.text_input("희망 전공", placeholder="예: 컴퓨터공학 / 생명과학 / 역사")
@@ -43,8 +36,8 @@ def main():
 
         try:
             user_grade = float(grade_input)
-            if not (1.0 <= user_grade <= 9.0):
-                st.error("내신 등급은 1.0부터 9.0 사이의 값으로 입력해주세요.")
+            if not (MIN_SCORE <= user_grade <= MAX_SCORE):
+                st.error(f"내신 등급은 {MIN_SCORE}부터 {MAX_SCORE} 사이의 값으로 입력해주세요.")
                 return
         except ValueError:
             st.error("내신 등급을 올바른 숫자 형식(예: 1.5)으로 입력해주세요.")
@@ -52,100 +45,38 @@ def main():
 
         result_container = st.container(border=True)
 
-        with st.spinner("지원 가능 대학 정보를 검색하고 있습니다. 잠시만 기다려주세요..."):
-
-            major_prompt = f"""
-            당신은 한국 대학의 전공 및 학과 연계성 전문가입니다.
-            '{major_input}' 전공과 관련된 학과를 다음 기준에 따라 폭넓지만, **학문적 연관성**을 최우선으로 고려하여 제시하세요.
-            만약 사용자가 선호 교과목으로 '{major_input}'을(를) 선택했다면, 해당 교과목의 지식이 많이 활용되는 관련 학과도 함께 추천하세요.
-
-            선정 기준:
-            1. **동일 전공/다른 표현** — 명칭만 다르고 내용이 동일한 학과.
-            2. **세부 전공/세부분야** — 해당 전공에서 파생된 세부 연구 분야.
-            3. **상위 계열 전공** — 해당 전공을 포함하는 넓은 계열.
-            4. **연구·교육 내용상 밀접한 전공** — 주요 교과목, 실험·연구 주제, 산업 응용 분야가 겹치는 전공.
-            5. **융합·응용 전공** — 타 분야와 결합하여 새로운 학문 영역을 형성한 전공.
-            6. **선호 교과목 연계** - 선호 교과목의 지식이 많이 활용되는 전공을 추가로 추천 (예: 물리 → 기계공학과, 전기전자공학과; 화학 → 신소재공학과, 약학과; 생명과학 → 의예과, 농학과).
-
-            **최우선 조건:**
-            **- 전공명에 키워드가 포함되어 있더라도, 학문적 연관성이 전혀 없는 학과(예: 물리 → 물리치료학과, 화학 → 문화학과)는 절대 포함하지 마세요.**
-            **- 오직 학문적, 교육적 내용이 실제로 밀접하게 연관된 전공만을 엄선하여 제시하세요.**
-
-            조건:
-            - 반드시 한국 대학에 실존하는 학과명 사용
-            - 10~15개 정도 제시
-            - 불필요한 설명 없이, 쉼표로 구분
-            - 명칭은 정확하게 표기
-
-            출력 예시:
-            화학과, 응용화학과, 화학공학과, 신소재공학과, 고분자공학과, 나노공학과, 에너지공학과, 환경공학과, 제약학과, 생명화학공학과, 재료공학과, 바이오화학과
-            """
+        with Trace(TRACK, LOG_REQUESTS) as trace, st.spinner("지원 가능 대학 정보를 검색하고 있습니다. 잠시만 기다려주세요..."):
 
-            related_majors_str = ask_gpt(major_prompt, API_KEY)
+            result = find(TRACK, major_input, user_grade, API_KEY, MAJOR_LOOKUP, MAJOR_GPT_FALLBACK, trace=trace)
+            trace.set(related=len(result.related))
+            display_related = result.display_related()
 
-            related_majors = []
-            if related_majors_str:
-                related_majors = [m.strip() for m in related_majors_str.split(',') if m.strip()]
-
-            if major_input not in related_majors:
-                related_majors.insert(0, major_input)
-
-            unique_related_majors = list(dict.fromkeys(related_majors))
-
-            display_related = [m for m in unique_related_majors if m and m.lower() != major_input.lower()]
-            display_related = display_related[:10]
-
-            major_pattern = '|'.join(re.escape(m) for m in unique_related_majors)
-
-            df_2025 = df[df['년도'] == 2025].copy()
-            major_filter_2025 = df_2025[df_2025['학과명'].str.contains(major_pattern, case=False, na=False)].copy()
-
-            if major_filter_2025.empty:
-                st.warning(f"'{major_input}'(와)과 유사한 전공으로 2025학년도 데이터가 검색되지 않았습니다.")
+            if result.status == NO_MAJOR:
+                st.warning(f"'{major_input}'(와)과 유사한 전공으로 {YEAR}학년도 데이터가 검색되지 않았습니다.")
                 return
 
-            major_filter_2025['match_priority'] = major_filter_2025['학과명'].apply(lambda x: 0 if major_input.lower() in x.lower() else 1)
-            major_filter_2025['등급_차이'] = abs(major_filter_2025['합격 등급'] - user_grade)
-            
-            grade_filter_2025 = major_filter_2025[major_filter_2025['등급_차이'] <= 0.5].copy()
-
-            if grade_filter_2025.empty:
-                st.info(f"입력하신 내신 등급 '{user_grade}'과 0.5등급 이내의 차이를 보이는 '{major_input}' 계열의 2025학년도 대학을 찾지 못했습니다. 다른 등급이나 전공을 입력해보세요.")
+            if result.status != FOUND:
+                st.info(f"입력하신 내신 등급 '{user_grade}'과 {SCORE_WINDOW}등급 이내의 차이를 보이는 '{major_input}' 계열의 {YEAR}학년도 대학을 찾지 못했습니다. 다른 등급이나 전공을 입력해보세요.")
                 return
 
-            result_2025 = grade_filter_2025 \
-                .sort_values(by=['match_priority', '등급_차이']) \
-                .drop_duplicates(subset=['대학명', '학과명']) \
-                .head(12)
+            results = result.results
+            with trace.stage("history"):
+                table_data, offsets = result.history()
 
-            with result_container:
+            with trace.stage("render"), result_container:
                 st.markdown("<p style='color:#696969 ; font-size:12px;'>"
                     f"작성하신 <b>[{major_input}]</b> 관련 학과에는 "
                     + ", ".join(display_related)
-                    + " 등이 있습니다. 학생부 교과 전형은 반영 교과, 환산 방식, 수능 최저학력기준 등 전형요소가 다양합니다. 반드시 대학별 모집요강을 면밀히 검토하고 선생님과의 심층 상담을 통하여 최적화된 지원 전략을 수립하는 것이 바람직합니다."
+                    + " 등이 있습니다. 학생부 교과 전형은 반영 교과, 환산 방식, 수능 최저학력기준 등 전형요소가 다양합니다. 안정·적정·소신은 연도별 합격선의 평균과 변동폭으로 추정한 참고용 구분입니다. 반드시 대학별 모집요강을 면밀히 검토하고 선생님과의 심층 상담을 통하여 최적화된 지원 전략을 수립하는 것이 바람직합니다."
                 "</p>", unsafe_allow_html=True)
 
-                for index, row_2025 in result_2025.iterrows():
-                    university_name = row_2025['대학명'].strip()
-                    major_name = row_2025['학과명'].strip()
-                    
-                    past_data = df[
-                        (df['대학명'] == university_name) & 
-                        (df['학과명'] == major_name) &
-                        (df['년도'].between(2023, 2025))
-                    ].sort_values(by='년도', ascending=False)
-
-                    st.markdown(f"##### 🎓 **{university_name} - {major_name}**")
-
-                    if not past_data.empty:
-                        table_data = past_data[['년도', '전형명', '합격 등급']].rename(columns={
-                            '합격 등급': '70% 등급'
-                        })
-                        table_data['년도'] = table_data['년도'].astype(str)
-                        table_data['70% 등급'] = table_data['70% 등급'].map('{:.2f}'.format)
-                        st.table(table_data.set_index('년도'))
+                for i, (university_name, major_name, label) in enumerate(zip(results['대학명'], results['학과명'], results['chance_label'])):
+                    st.markdown(f"##### 🎓 **{university_name} - {major_name}** ({label})")
+
+                    if offsets[i] < offsets[i + 1]:
+                        st.table(table_data.iloc[offsets[i]:offsets[i + 1]])
                     else:
-                        st.markdown(f"  - 해당 학과에 대한 2023-2025학년도 입시 데이터가 없습니다.")
+                        st.markdown(f"  - 해당 학과에 대한 {START_YEAR}-{YEAR}학년도 입시 데이터가 없습니다.")
                 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,106 @@
+import streamlit as st
+
+from utils.admissions import FOUND, NO_MAJOR, TRACKS, find_tracks, merge_results
+from utils.eligibility import load_eligibility
+from utils.telemetry import Trace
+
+API_KEY = st.secrets["openai_api_key"]
+MAJOR_LOOKUP = st.secrets.get("major_lookup", "index")
+MAJOR_GPT_FALLBACK = st.secrets.get("major_gpt_fallback", False)
+LOG_REQUESTS = st.secrets.get("log_requests", False)
+
+GRADE_TRACKS = ["교과", "종합", "특별"]
+PERCENTILE_TRACK = "정시"
+
+st.set_page_config(
+    page_title="HighAI",
+    page_icon="🎓",
+    layout="centered"
+)
+
+st.header("💬 전체 전형 대학 찾기")
+st.caption("**✅ 사용방법 :** 희망 전공과 내신 등급, 모의고사 백분위 평균 중 아는 것을 입력하고 '지원 대학 검색' 버튼을 눌러주세요. 특별 전형은 지원 자격을 선택한 경우에만 검색합니다.  \n **⚠️ 주의사항 :** 검색 결과는 참고용이며, 반드시 담임 선생님과 상담하여 신중하게 결정하세요.")
+
+def parse_score(text, name, track):
+    """빈 칸이면 None, 잘못된 값이면 오류를 보여주고 False."""
+    if not text:
+        return None
+    low, high = TRACKS[track]["score_range"]
+    try:
+        score = float(text)
+    except ValueError:
+        st.error(f"{name}을 올바른 숫자 형식으로 입력해주세요.")
+        return False
+    if not (low <= score <= high):
+        st.error(f"{name}은 {low}부터 {high} 사이의 값으로 입력해주세요.")
+        return False
+    return score
+
+def show_results(major_input, results):
+    display_related = next(iter(results.values())).display_related()
+    st.markdown("<p style='color:#696969 ; font-size:14px;'>"
+                f"작성하신 <b>[{major_input}]</b> 관련 학과에는 "
+                + ", ".join(display_related)
+                + " 등이 있습니다. 전형마다 평가 요소와 반영 방식이 다르므로, 안정·적정·소신은 연도별 합격선의 평균과 변동폭으로 추정한 참고용 구분입니다. 연도별 합격선이 없는 특별 전형은 구분 없이(-) 성적과 합격 등급의 차이가 작은 순으로 보여드립니다. 반드시 대학별 모집요강을 면밀히 검토하고 선생님과의 심층 상담을 통하여 최적화된 지원 전략을 수립하는 것이 바람직합니다."
+                "</p>", unsafe_allow_html=True)
+
+    tabs = st.tabs(["전체"] + [f"{track} 전형" for track in results])
+    with tabs[0]:
+        merged = merge_results(results)
+        if merged.empty:
+            st.info(f"입력하신 성적과 가까운 '{major_input}' 계열의 대학을 찾지 못했습니다. 다른 성적이나 전공을 입력해보세요.")
+        else:
+            st.dataframe(merged, hide_index=True, use_container_width=True)
+
+    for tab, (track, result) in zip(tabs[1:], results.items()):
+        with tab:
+            config = TRACKS[track]
+            year = f"{result.year}학년도 " if result.year else ""
+            if result.status == NO_MAJOR:
+                st.warning(f"'{major_input}'(와)과 유사한 전공으로 {year}{track} 전형 데이터가 검색되지 않았습니다.")
+            elif result.status != FOUND:
+                st.info(f"입력하신 성적과 {config['window']} 이내의 차이를 보이는 '{major_input}' 계열의 {year}{track} 전형 대학을 찾지 못했습니다.")
+            else:
+                st.dataframe(result.table(), hide_index=True, use_container_width=True)
+
+def main():
+    major_input = st.text_input("희망 전공", placeholder="예: 컴퓨터공학 / 생명과학 / 역사")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        grade_input = st.text_input("내신 등급", placeholder="예: 1.5 (소수점 첫째 자리까지)")
+    with col2:
+        percentile_input = st.text_input("모의고사 백분위 평균", placeholder="예: 85.5 (소수점 첫째 자리까지)")
+
+    option_input = st.multiselect(
+        "특별 전형 지원 자격 (선택)",
+        options=load_eligibility(TRACKS["특별"]["dataset"]).names,
+        placeholder="해당하는 경우에만 선택하세요. (여러 개 선택 가능)"
+    )
+
+    if st.button("지원 대학 검색"):
+        if not major_input or not (grade_input or percentile_input):
+            st.error("희망 전공과 함께 내신 등급이나 모의고사 백분위 평균 중 하나 이상을 입력해야 합니다.")
+            return
+
+        user_grade = parse_score(grade_input, "내신 등급", "교과")
+        user_percentile = parse_score(percentile_input, "모의고사 백분위 평균", PERCENTILE_TRACK)
+        if user_grade is False or user_percentile is False:
+            return
+
+        scores = {track: user_grade for track in GRADE_TRACKS}
+        scores[PERCENTILE_TRACK] = user_percentile
+        if not option_input:
+            scores["특별"] = None
+
+        with Trace("전체", LOG_REQUESTS, options=len(option_input)) as trace:
+            with st.spinner("전체 전형의 지원 가능 대학 정보를 검색하고 있습니다. 잠시만 기다려주세요..."):
+                results = find_tracks(major_input, scores, API_KEY, MAJOR_LOOKUP, MAJOR_GPT_FALLBACK,
+                                      filters={'지원자격': option_input}, trace=trace)
+                trace.set(related=len(next(iter(results.values())).related))
+
+            with trace.stage("render"):
+                show_results(major_input, results)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import io
+
+import streamlit as st
+
+from utils.batch import (EXCEL_AVAILABLE, GRADE_COLUMN, MAJOR_COLUMN, OPTION_COLUMN, PERCENTILE_COLUMN, format_stats,
+                         output_columns, read_students, run_batch, to_excel, to_frame)
+
+API_KEY = st.secrets["openai_api_key"]
+MAJOR_LOOKUP = st.secrets.get("major_lookup", "index")
+MAJOR_GPT_FALLBACK = st.secrets.get("major_gpt_fallback", False)
+
+TEMPLATE = f"이름,{MAJOR_COLUMN},{GRADE_COLUMN},{PERCENTILE_COLUMN},{OPTION_COLUMN}\n홍길동,컴퓨터공학,2.3,88.5,\n김철수,생명과학,1.8,,농어촌\n"
+
+st.set_page_config(
+    page_title="HighAI",
+    page_icon="🎓",
+    layout="centered"
+)
+
+st.header("💬 일괄 추천 받기")
+st.caption(f"**✅ 사용방법 :** 학생 목록 CSV 파일({MAJOR_COLUMN}, {GRADE_COLUMN}, {PERCENTILE_COLUMN}, {OPTION_COLUMN} 열)을 올리고 '일괄 추천 시작' 버튼을 눌러주세요. 내신 등급이 있으면 교과·종합 전형을, 모의고사 백분위가 있으면 정시 전형을, 지원자격이 있으면 특별 전형도 함께 검색합니다.  \n **⚠️ 주의사항 :** 검색 결과는 참고용이며, 반드시 학생과 상담하여 신중하게 결정하세요.")
+
+def main():
+    st.download_button("📄 입력 양식 내려받기", TEMPLATE.encode("utf-8-sig"), file_name="학생목록_양식.csv", mime="text/csv")
+
+    uploaded = st.file_uploader("학생 목록 CSV", type=["csv"])
+    if uploaded is None:
+        return
+
+    try:
+        students = read_students(io.BytesIO(uploaded.getvalue()))
+    except ValueError as e:
+        st.error(f"CSV 파일을 읽을 수 없습니다: {e}")
+        return
+    st.caption(f"학생 {len(students)}명을 불러왔습니다.")
+
+    if st.button("일괄 추천 시작"):
+        progress_bar = st.progress(0.0, text="관련 학과를 찾고 있습니다...")
+
+        def report(done, total):
+            if done % 10 == 0 or done == total:
+                progress_bar.progress(done / total, text=f"{done}/{total}명 검색 완료")
+
+        stats = {}
+        chunks = [chunk for _, chunk in run_batch(students, API_KEY, MAJOR_LOOKUP, MAJOR_GPT_FALLBACK, report, stats)]
+        results = to_frame(chunks, output_columns(students))
+        st.session_state["batch_results"] = (uploaded.name, results, stats)
+
+    if "batch_results" not in st.session_state or st.session_state["batch_results"][0] != uploaded.name:
+        return
+
+    name, results, stats = st.session_state["batch_results"]
+    st.success(format_stats(stats))
+    if stats.get("expand_errors"):
+        st.warning(f"관련 학과를 찾지 못한 전공 {stats['expand_errors']}개는 추천 비고에 안내 문구만 넣었습니다. 잠시 후 다시 시도해주세요.")
+    st.dataframe(results.head(100), hide_index=True, use_container_width=True)
+
+    stem = name.rsplit(".", 1)[0]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ CSV 로 내려받기", results.to_csv(index=False).encode("utf-8-sig"),
+                           file_name=f"{stem}_추천결과.csv", mime="text/csv", use_container_width=True)
+    with col2:
+        if EXCEL_AVAILABLE:
+            st.download_button("⬇️ 엑셀로 내려받기", to_excel(results), file_name=f"{stem}_추천결과.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                               use_container_width=True)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import streamlit as st
+import pandas as pd
+
+from utils.llm import metrics as llm_metrics
+from utils.majors import major_cache
+from utils.result_cache import result_cache
+from utils.telemetry import LOG_PATH, latency_summary, read_log, stage_summary
+from utils.topics import topic_cache
+
+ADMIN_PASSWORD = st.secrets.get("admin_password")
+
+PERIODS = {"최근 1시간": "1h", "최근 1일": "1D", "최근 7일": "7D", "전체": None}
+# 가장 느린 요청 표에 보여줄 결과 항목 (있는 것만)
+QUERY_COLUMNS = ['result', 'options', 'related', 'candidates', 'results', 'topics', 'fresh', 'cache_hit', 'result_cache_hit', 'turn']
+
+st.set_page_config(
+    page_title="HighAI",
+    page_icon="🎓",
+    layout="wide"
+)
+
+st.header("📊 운영 지표")
+
+def main():
+    if not ADMIN_PASSWORD:
+        st.info("관리자 비밀번호(admin_password)를 설정하면 이 페이지를 볼 수 있습니다.")
+        return
+    if st.text_input("관리자 비밀번호", type="password") != ADMIN_PASSWORD:
+        return
+
+    df = read_log()
+    if df.empty:
+        st.info(f"아직 기록된 요청이 없습니다. 요청 로그는 log_requests 를 켰을 때만 남습니다. ({LOG_PATH})")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        period = st.selectbox("기간", list(PERIODS), index=1)
+    with col2:
+        pages = st.multiselect("페이지", sorted(df['page'].unique()))
+
+    if PERIODS[period]:
+        df = df[df['ts'] >= df['ts'].max() - pd.Timedelta(PERIODS[period])]
+    if pages:
+        df = df[df['page'].isin(pages)]
+    if df.empty:
+        st.info("조건에 맞는 요청이 없습니다.")
+        return
+
+    errors = (df['status'] != 'ok').mean()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("요청 수", f"{len(df):,}")
+    col2.metric("p50 (ms)", f"{df['total_ms'].quantile(0.5):,.0f}")
+    col3.metric("p95 (ms)", f"{df['total_ms'].quantile(0.95):,.0f}")
+    col4.metric("오류율", f"{errors:.1%}")
+
+    st.subheader("페이지별 응답 시간 (ms)")
+    st.dataframe(latency_summary(df).round(1), use_container_width=True)
+
+    st.subheader("단계별 소요 시간 (ms)")
+    st.caption("expand: 관련 학과 찾기 · load: 데이터/색인 준비 · filter: 전공·점수 조건 · rank: 정렬 · history: 연도별 이력 · render: 화면 구성 · ttft: LLM 첫 토큰")
+    st.dataframe(stage_summary(df).round(1), use_container_width=True)
+
+    st.subheader("가장 느린 요청")
+    columns = ['ts', 'page', 'status', 'total_ms'] + [c for c in QUERY_COLUMNS if c in df.columns]
+    columns += sorted(c for c in df.columns if c.startswith(('stages.', 'llm.')))
+    st.dataframe(df.nlargest(20, 'total_ms')[columns], hide_index=True, use_container_width=True)
+
+    st.subheader("LLM · 캐시")
+    col1, col2, col3, col4 = st.columns(4)
+    if 'llm.total_tokens' in df.columns:
+        col1.metric("사용 토큰", f"{int(df['llm.total_tokens'].fillna(0).sum()):,}")
+    if 'cache_hit' in df.columns and df['cache_hit'].notna().any():
+        col2.metric("탐구 주제 캐시 적중률", f"{df['cache_hit'].dropna().astype(bool).mean():.0%}")
+    if 'result_cache_hit' in df.columns and df['result_cache_hit'].notna().any():
+        col3.metric("검색 결과 캐시 적중률", f"{df['result_cache_hit'].dropna().astype(bool).mean():.0%}")
+    col4.metric("관련 학과 캐시 적중률 (현재 프로세스)", f"{major_cache.hit_rate():.0%}")
+    st.caption(f"현재 프로세스 LLM 호출: {llm_metrics.snapshot()} · 탐구 주제 캐시: {topic_cache.stats}  \n"
+               f"검색 결과 캐시: {len(result_cache)}개 · {result_cache.size / 2 ** 20:.1f}MB · {result_cache.stats}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,28 @@
+import pytest
+
+from utils.admissions import MERGED_COLUMNS, find, merge_results, quantize_score, related_majors, search_tracks
+from utils.result_cache import result_cache
+
+
+@pytest.mark.parametrize("track, score, expected", [
+    ("교과", 1.15, 1.2), ("교과", 2.55, 2.6), ("교과", 4.05, 4.1), ("교과", 1.25, 1.3), ("교과", 2.45, 2.5),
+    ("교과", 1.14, 1.1), ("교과", 9.0, 9.0), ("종합", 3.35, 3.4),
+    ("정시", 84.5, 85.0), ("정시", 85.5, 86.0), ("정시", 84.49, 84.0), ("정시", 100.0, 100.0),
+])
+def test_quantize_rounds_half_up(track, score, expected):
+    assert quantize_score(track, score) == expected
+
+
+def test_find_shares_cache_across_rounded_scores():
+    result_cache.clear()
+    first = find("교과", "간호", 2.55, None)
+    assert find("교과", "간호", 2.6, None) is first
+    assert find("교과", "간호", 2.5, None) is not first
+
+
+def test_tables_follow_track_columns():
+    special = find("특별", "컴퓨터공학", 3.1, None, filters={"지원자격": ["농어촌"]})
+    assert list(special.table().columns) == ["대학명", "학과명", "전형유형", "전형명", "70% 등급"]
+    results = search_tracks("컴퓨터공학", related_majors("컴퓨터공학", None), {"교과": 2.5, "특별": 2.5},
+                            filters={"지원자격": ["농어촌"]})
+    assert list(merge_results(results).columns) == ["전형"] + MERGED_COLUMNS
@@ -0,0 +1,61 @@
+import pytest
+
+from utils.api import MAX_QUERIES, QueryError, create_app, parse_query
+
+
+@pytest.fixture(scope="module")
+def client():
+    return create_app(token="secret").test_client()
+
+
+def _post(client, payload):
+    return client.post("/search", json=payload, headers={"Authorization": "Bearer secret"})
+
+
+@pytest.mark.parametrize("query, message", [
+    ({"track": "교과", "major": "간호", "score": True}, "score"),
+    ({"track": "교과", "major": "간호", "score": "abc"}, "score"),
+    ({"track": "교과", "major": "간호", "score": 9.5}, "범위"),
+    ({"track": "교과", "major": ["간호"], "score": 2}, "major"),
+    ({"track": "교과", "major": " ", "score": 2}, "major"),
+    ({"track": "수시", "major": "간호", "score": 2}, "track"),
+    ({"track": "특별", "major": "간호", "score": 3}, "eligibility"),
+    ({"track": "특별", "major": "간호", "score": 3, "eligibility": 5}, "eligibility"),
+    ({"track": "특별", "major": "간호", "score": 3, "eligibility": ["농어촌", 1]}, "eligibility"),
+    ({"track": "특별", "major": "간호", "score": 3, "eligibility": ["외계인"]}, "외계인"),
+])
+def test_invalid_queries(query, message):
+    with pytest.raises(QueryError, match=message):
+        parse_query(query)
+
+
+def test_eligibility_accepts_aliases_and_strings():
+    base = {"track": "특별", "major": "간호", "score": 3}
+    assert parse_query({**base, "eligibility": ["기초생활수급자", "농어촌"]})[3] == {'지원자격': ['기초생활', '농어촌']}
+    assert parse_query({**base, "eligibility": "농어촌, 한부모"})[3] == {'지원자격': ['농어촌', '한부모']}
+
+
+def test_bad_query_in_batch_does_not_fail_others(client):
+    response = _post(client, {"queries": [
+        {"track": "특별", "major": "간호", "score": 3, "eligibility": 5},
+        {"track": "교과", "major": "간호", "score": 2.5},
+    ]})
+    assert response.status_code == 200
+    first, second = response.get_json()["results"]
+    assert "error" in first
+    assert second["status"] == "found" and len(second["rows"]) == 12
+    assert all(len(row["history"]) >= 1 for row in second["rows"])
+
+
+def test_single_query_statuses(client):
+    assert _post(client, {"track": "교과", "major": "간호", "score": True}).status_code == 400
+    found = _post(client, {"track": "특별", "major": "간호", "score": 4, "eligibility": ["농어촌"]}).get_json()
+    assert found["status"] == "found"
+    assert all(row["chance"] is None and row["label"] is None for row in found["rows"])
+
+
+def test_limits_and_auth(client):
+    assert client.post("/search", json={"track": "교과"}).status_code == 401
+    assert client.get("/health").status_code == 200
+    assert _post(client, {"queries": [{}] * (MAX_QUERIES + 1)}).status_code == 413
+    assert _post(client, {"queries": []}).status_code == 400
@@ -0,0 +1,71 @@
+import io
+from concurrent.futures import Future
+
+import pytest
+
+from utils import majors
+from utils.admissions import find
+from utils.batch import RESULT_COLUMNS, output_columns, read_students, run_batch, to_frame
+
+CSV = "이름,비고,희망 전공,내신 등급,모의고사 백분위,지원자격\n가,1반,간호,2.53,81.4,\n나,2반,컴퓨터공학,3.1,,농어촌\n다,3반,,2,,\n"
+
+
+def _run(text):
+    students = read_students(io.BytesIO(text.encode("utf-8")))
+    chunks = [chunk for _, chunk in run_batch(students, None)]
+    return to_frame(chunks, output_columns(students))
+
+
+def test_student_columns_are_kept():
+    df = _run(CSV)
+    assert list(df.columns[:6]) == ["이름", "비고", "희망 전공", "내신 등급", "모의고사 백분위", "지원자격"]
+    assert set(df["비고"]) == {"1반", "2반", "3반"}
+    assert df.loc[df["이름"] == "다", "추천 비고"].tolist() == ["희망 전공이 비어 있습니다."]
+
+
+def test_rows_match_find():
+    df = _run(CSV)
+    for track, score in (("교과", 2.53), ("정시", 81.4)):
+        expected = find(track, "간호", score, None).results
+        rows = df[(df["이름"] == "가") & (df["추천 전형"] == track)]
+        assert rows["추천 대학명"].tolist() == expected["대학명"].astype(str).tolist()
+        assert rows["추천 전형명"].tolist() == expected["전형명"].astype(str).tolist()
+
+    special = df[(df["이름"] == "나") & (df["추천 전형"] == "특별")]
+    expected = find("특별", "컴퓨터공학", 3.1, None, filters={"지원자격": ["농어촌"]}).results
+    assert special["추천 대학명"].tolist() == expected["대학명"].astype(str).tolist()
+    assert set(special["추천 구분"]) == {""}
+
+
+def test_reserved_result_columns_are_rejected():
+    with pytest.raises(ValueError, match=RESULT_COLUMNS[0]):
+        read_students(io.BytesIO(f"희망 전공,내신 등급,{RESULT_COLUMNS[0]}\n간호,2,x\n".encode("utf-8")))
+
+
+def test_failed_expansion_only_affects_its_students(tmp_path, monkeypatch):
+    answers = {"간호": "간호학과, 간호학", "천문학": "", "컴퓨터공학": RuntimeError("rate limited")}
+    asked = []
+
+    def fake_gpt(prompt, api_key, timeout=None):
+        major = next(m for m in answers if f"'{m}' 전공" in prompt)
+        asked.append(major)
+        future = Future()
+        answer = answers[major]
+        future.set_exception(answer) if isinstance(answer, Exception) else future.set_result(answer)
+        return future
+
+    monkeypatch.setattr(majors, "submit_gpt", fake_gpt)
+    monkeypatch.setattr(majors, "ask_gpt", lambda *args, **kwargs: fake_gpt(*args, **kwargs).result())
+    monkeypatch.setattr(majors, "major_cache", majors.LLMCache(str(tmp_path / "majors.sqlite3")))
+
+    text = "이름,희망 전공,내신 등급\n가,간호,2.5\n나,컴퓨터공학,3\n다,천문학,2\n라,천문학,4\n"
+    students = read_students(io.BytesIO(text.encode("utf-8")))
+    stats = {}
+    chunks = [chunk for _, chunk in run_batch(students, "key", lookup="gpt", stats=stats)]
+    df = to_frame(chunks, output_columns(students))
+
+    assert sorted(asked) == ["간호", "천문학", "컴퓨터공학"]
+    assert stats["expand_errors"] == 1
+    assert df.loc[df["이름"] == "나", "추천 비고"].tolist() == ["관련 학과를 찾는 중 오류가 났습니다. 잠시 후 다시 시도해주세요."]
+    assert (df.loc[df["이름"] == "가", "추천 대학명"] != "").all()
+    assert set(df["이름"]) == {"가", "나", "다", "라"}
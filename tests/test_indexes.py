@@ -0,0 +1,84 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data import CATEGORY_COLUMNS, append_results, load_results, prepare_results
+from utils.eligibility import EligibilityIndex, normalize_options, parse_eligibility
+from utils.history import HistoryIndex
+from utils.matcher import MajorMatcher
+from utils.score_index import ScoreIndex
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_results('Early_Results1')
+
+
+@pytest.mark.parametrize("patterns", [["컴퓨터"], ["간호", "보건"], ["(야간)"], ["AI", "ai융합"], ["학"], ["없는학과명"], [""]])
+def test_matcher_matches_str_contains(df, patterns):
+    matcher = MajorMatcher(df['학과명'].cat.categories)
+    pattern = '|'.join(re.escape(p) for p in patterns)
+    # 빈 전공은 아무 학과도 고르지 않는다 (검색 전에 걸러지는 입력)
+    expected = df['학과명'].astype(str).str.contains(pattern, case=False, na=False).to_numpy() & bool(pattern)
+    assert (matcher.contains(df['학과명'], patterns) == expected).all()
+
+
+def _split(df, year):
+    """year 행을 뺀 데이터와 그 행을 append_results 로 다시 붙인 데이터 (ingest 와 같은 경로)."""
+    columns = [col for col in CATEGORY_COLUMNS if col in df.columns]
+    old = df[df['년도'] != year].reset_index(drop=True)
+    for col in columns:
+        old[col] = old[col].cat.remove_unused_categories()
+    raw = df[df['년도'] == year].astype({col: str for col in columns})
+    combined = append_results(old, prepare_results(raw.reset_index(drop=True), like=old))
+    return old, combined
+
+
+def test_indexes_extend_like_rebuild(df):
+    old, combined = _split(df, int(df['년도'].max()))
+    start = len(old)
+
+    extended, rebuilt = ScoreIndex(old).extend(combined, start), ScoreIndex(combined)
+    assert extended.partitions.keys() == rebuilt.partitions.keys()
+    for year in rebuilt.partitions:
+        assert (extended.partitions[year][0] == rebuilt.partitions[year][0]).all()
+    assert (extended.scores == rebuilt.scores).all()
+
+    extended, rebuilt = HistoryIndex(old).extend(combined, start), HistoryIndex(combined)
+    assert (extended.order == rebuilt.order).all()
+    assert (extended.sorted_keys == rebuilt.sorted_keys).all()
+
+    categories = combined['학과명'].cat.categories
+    extended, rebuilt = MajorMatcher(old['학과명'].cat.categories).extend(categories), MajorMatcher(categories)
+    for patterns in (["컴퓨터"], ["간호"], ["교육"]):
+        assert (extended.match(patterns) == rebuilt.match(patterns)).all()
+
+
+def test_score_window_and_rank(df):
+    index = ScoreIndex(df)
+    year = int(df['년도'].max())
+    rows = index.window(2.5, 0.5, year)
+    scores = index.scores[rows]
+    assert (np.abs(scores - 2.5) <= 0.5).all() and (np.diff(scores) >= 0).all()
+    expected = np.flatnonzero((df['년도'].to_numpy() == year) & (np.abs(index.scores - 2.5) <= 0.5))
+    assert sorted(rows) == list(expected)
+
+    mask = np.ones(len(df['학과명'].cat.categories), dtype=bool)
+    top = index.rank(rows, mask, 2.5, 12)
+    assert len(top) == 12 and not top.duplicated(['대학명', '학과명']).any()
+    assert top['score_diff'].is_monotonic_increasing
+
+
+def test_eligibility():
+    assert parse_eligibility("농어촌, 기초생활수급자/한부모가족") == ['농어촌', '기초생활', '한부모']
+    assert parse_eligibility(None) == []
+    assert normalize_options(["차상위계층", "농어촌", "농어촌"]) == ('농어촌', '차상위')
+
+    series = pd.Series(["농어촌", "기초생활수급자, 차상위", None, "특성화고/농어촌", "서해5도"])
+    index = EligibilityIndex(series)
+    assert index.names[-1] == "서해5도"
+    assert index.mask(["농어촌"]).tolist() == [True, False, False, True, False]
+    assert index.mask("차상위계층, 서해5도").tolist() == [False, True, False, False, True]
+    assert not index.mask(["없는자격"]).any()
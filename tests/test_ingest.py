@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from utils import data, ingest, shared
+from utils.admissions import search, year_range
+
+
+def _setup(name, tmp_path, monkeypatch):
+    """최근 연도 행을 뺀 name 데이터셋을 임시 data 디렉터리에 두고, 뺀 행을 새 연도 CSV 로 돌려준다."""
+    source = pd.read_csv(data.data_path(name), dtype=str, keep_default_na=False)
+    latest = source['년도'].astype(int).max()
+    (tmp_path / "snapshot").mkdir()
+    monkeypatch.setattr(data, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data, "SNAPSHOT_DIR", str(tmp_path / "snapshot"))
+    monkeypatch.setattr(shared, "SHARED_DIR", str(tmp_path / "shared"))
+
+    source[source['년도'].astype(int) != latest].to_csv(data.data_path(name), index=False)
+    new_year = tmp_path / "new.csv"
+    source[source['년도'].astype(int) == latest].to_csv(new_year, index=False)
+    return str(new_year), latest
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    return _setup('Regular_Results1', tmp_path, monkeypatch)
+
+
+def test_ingest_appends_year_and_matches_full_read(dataset):
+    new_year, latest = dataset
+    assert year_range('정시')[1] == latest - 1
+
+    stats = ingest.ingest('Regular_Results1', new_year)
+    assert stats["added"] > 0 and stats["years"] == [latest]
+    assert year_range('정시') == (latest - 1, latest)
+
+    ingested = search('정시', '경영', ['경영', '회계', '경제'], 85.0).results
+    data._cache.pop('Regular_Results1')
+    fresh = data.load_results('Regular_Results1')
+    assert len(fresh) == stats["rows"]
+    assert search('정시', '경영', ['경영', '회계', '경제'], 85.0).results.equals(ingested)
+
+    again = ingest.ingest('Regular_Results1', new_year)
+    assert again["added"] == 0 and again["duplicates"] + again["no_score"] == again["received"]
+
+
+def test_ingest_drops_placeholder_scores(tmp_path, monkeypatch):
+    # Early_Results1 의 2025년에는 범위(1~9등급)를 벗어난 자리 표시 점수가 있다. 파일 전체를 거부하지 않고 그 행만 뺀다
+    new_year, latest = _setup('Early_Results1', tmp_path, monkeypatch)
+    raw = pd.read_csv(new_year, dtype=str, keep_default_na=False)
+    scores = pd.to_numeric(raw['합격 등급'], errors='coerce')
+    out_of_range = int((scores.notna() & ~scores.between(1.0, 9.0)).sum())
+    assert out_of_range > 0
+
+    stats = ingest.ingest('Early_Results1', new_year)
+    assert stats["out_of_range"] == out_of_range and stats["years"] == [latest]
+    assert stats["added"] + stats["duplicates"] + stats["no_score"] + stats["out_of_range"] == stats["received"]
+    assert year_range('교과')[1] == latest
+    df = data.load_results('Early_Results1')
+    assert df.loc[df['년도'] == latest, '합격 등급'].between(1.0, 9.0).all()
+    assert len(df[df['년도'] == latest]) == stats["added"]
+    assert "점수 범위 밖" in ingest.format_stats(stats)
+
+
+def test_ingest_rejects_conflicts_and_bad_rows(dataset, tmp_path):
+    new_year, _ = dataset
+    ingest.ingest('Regular_Results1', new_year)
+    path = data.data_path('Regular_Results1')
+    before = open(path, 'rb').read()
+
+    raw = pd.read_csv(new_year, dtype=str, keep_default_na=False)
+    scored = pd.to_numeric(raw['합격 백분위'], errors='coerce').notna()
+    changed = raw[scored].head(1).copy()
+    changed['합격 백분위'] = (pd.to_numeric(changed['합격 백분위']) + 1).astype(str)
+    changed.to_csv(tmp_path / "conflict.csv", index=False)
+    with pytest.raises(ValueError, match="점수가 다른"):
+        ingest.ingest('Regular_Results1', str(tmp_path / "conflict.csv"))
+
+    changed['합격 백분위'] = "150"
+    changed.to_csv(tmp_path / "range.csv", index=False)
+    stats = ingest.ingest('Regular_Results1', str(tmp_path / "range.csv"))
+    assert stats["added"] == 0 and stats["out_of_range"] == 1
+
+    changed.drop(columns=['년도']).to_csv(tmp_path / "columns.csv", index=False)
+    with pytest.raises(ValueError, match="열이 없습니다"):
+        ingest.ingest('Regular_Results1', str(tmp_path / "columns.csv"))
+    assert open(path, 'rb').read() == before
@@ -0,0 +1,63 @@
+import asyncio
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from benchmarks import stub_openai
+from utils import llm
+
+LIMIT = 2
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """재시도가 필요한 실패를 섞는 stub 서버에 연결하고, 동시 요청 상한을 LIMIT 으로 줄인다."""
+    server, state = stub_openai.serve(port=0, latency=0.05, fail_rate=0.3)
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    # 실패가 몇 번 겹쳐도 재시도로 끝나도록 늘린다 (retry-after: 0 이라 기다리지 않는다)
+    monkeypatch.setattr(llm, "MAX_RETRIES", 10)
+    monkeypatch.setattr(llm, "_slots", asyncio.Semaphore(LIMIT))
+    # 클라이언트는 키별로 캐시되므로 이 서버 주소를 쓰는 새 키를 준다
+    yield f"stub-{server.server_port}", state
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_idle(timeout=5):
+    deadline = time.monotonic() + timeout
+    while llm.metrics.snapshot()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return llm.metrics.snapshot()["in_flight"] == 0
+
+
+def test_retries_and_concurrency_cap(stub):
+    api_key, state = stub
+    before = llm.metrics.snapshot()
+    futures = [llm.submit_gpt(f"질문 {i}", api_key) for i in range(12)]
+    done, _ = wait(futures, timeout=30)
+    assert len(done) == len(futures)
+    assert all(future.result() == stub_openai.REPLY for future in futures)
+
+    after = llm.metrics.snapshot()
+    assert state.failures > 0
+    assert after["retries"] - before["retries"] == state.failures
+    assert after["errors"] == before["errors"]
+    assert state.requests == len(futures) + state.failures
+    assert 1 < state.peak_active <= LIMIT
+
+
+def test_closed_stream_releases_slot(stub, monkeypatch):
+    api_key, state = stub
+    monkeypatch.setattr(llm, "_slots", asyncio.Semaphore(1))
+    # 응답을 길게 해 첫 토큰을 받은 뒤 닫을 때 스트림이 아직 이어지고 있게 한다
+    monkeypatch.setattr(stub_openai, "REPLY", "탐구 " * 100000)
+    stats = {}
+    stream = llm.stream_chat([{"role": "user", "content": "탐구 주제"}], api_key, stats)
+    assert next(stream)
+    stream.close()
+    assert "total_time" in stats and "completion_tokens" not in stats
+    assert _wait_idle()
+
+    # 상한이 1 이므로 취소된 스트림이 자리를 돌려주지 않았다면 이 요청은 끝나지 않는다
+    assert llm.submit_gpt("다음 질문", api_key).result(timeout=10) == stub_openai.REPLY
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.major_index import _similarity_graph, load_index, major_stem
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = """
+from utils.major_index import _similarity_graph, load_index
+index = load_index()
+print(_similarity_graph(index.stems[:800]))
+print([(m, index.lookup(m), index.suggest(m)) for m in ('역사', '간호', '컴퓨타', '겅영', '화학공', '데사')])
+"""
+
+
+@pytest.fixture(scope="module")
+def index():
+    return load_index()
+
+
+def test_major_stem():
+    assert major_stem("컴퓨터공학부(야간)") == "컴퓨터공학"
+    assert major_stem("경영학과") == "경영학"
+
+
+def test_lookup(index):
+    assert "컴퓨터공학" in index.lookup("컴공")
+    assert index.suggest("겅영")[0][0] == "경영"
+    assert index.correct("컴퓨타공학") == "컴퓨터공학"
+    assert not any("치료" in stem for stem in index.lookup("물리"))
+    assert index.lookup("") == []
+
+
+def test_similarity_ties_are_ordered_by_name():
+    # 0 은 1 과 '가나', 2 와 '나다' 를 같은 무게로 나눠 가진다. 나머지는 겹치는 bigram 이 없는 학과
+    fillers = [chr(0xAC00 + 100 * i) + chr(0xAC00 + 100 * i + 50) for i in range(1, 17)]
+    related = _similarity_graph(["가나다", "가나바", "사나다"] + fillers)
+    assert related[0][0][1] == related[0][1][1]
+    assert [j for j, _ in related[0]] == [1, 2]
+
+
+def test_build_and_lookup_do_not_depend_on_hash_seed():
+    outputs = {
+        subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True,
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(outputs) == 1
@@ -0,0 +1,32 @@
+import numpy as np
+
+from utils.result_cache import ResultCache, entry_bytes
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_bytes=3 * entry_bytes(np.zeros(100)))
+    for i in range(3):
+        cache.set(("a", 1, i), np.zeros(100))
+    assert cache.get(("a", 1, 0)) is not None
+    cache.set(("a", 1, 3), np.zeros(100))
+    assert cache.get(("a", 1, 1)) is None
+    assert cache.get(("a", 1, 0)) is not None
+    assert len(cache) == 3 and cache.stats["evictions"] == 1
+    assert cache.size == 3 * entry_bytes(np.zeros(100))
+
+
+def test_version_change_invalidates_only_that_dataset():
+    cache = ResultCache(max_bytes=2 ** 20)
+    cache.set(("a", 1, "x"), np.zeros(10))
+    cache.set(("b", 1, "x"), np.zeros(10))
+    assert cache.get(("a", 2, "x")) is None
+    assert cache.stats["invalidations"] == 1
+    assert cache.get(("b", 1, "x")) is not None
+    assert len(cache) == 1
+
+
+def test_oversized_entries_are_not_stored():
+    cache = ResultCache(max_bytes=100)
+    cache.set(("a", 1, "x"), np.zeros(1000))
+    assert len(cache) == 0 and cache.size == 0
+    assert cache.hit_rate() == 0.0
@@ -0,0 +1,84 @@
+"""admissions.search 가 엔진 도입 전 페이지의 pandas 필터(str.contains -> 점수 차이 -> 정렬·중복 제거)와 같은 결과를 내는지."""
+import random
+import re
+
+import pytest
+
+from utils.admissions import FOUND, NO_MAJOR, NO_SCORE, TRACKS, search, year_range
+from utils.data import load_results, score_values
+from utils.major_index import load_index
+
+QUERIES_PER_TRACK = 150
+
+
+def baseline(df, track, major_input, related, score):
+    """기존 페이지 코드의 검색. (status, 결과 DataFrame)"""
+    config = TRACKS[track]
+    column = config["score_column"]
+    years = year_range(track)
+    base = df if years is None else df[df['년도'] == years[1]]
+    pattern = '|'.join(re.escape(m) for m in related)
+    major_filter = base[base['학과명'].str.contains(pattern, case=False, na=False)].copy()
+    if major_filter.empty:
+        return NO_MAJOR, None
+    major_filter['match_priority'] = major_filter['학과명'].apply(lambda x: 0 if major_input.lower() in x.lower() else 1)
+    major_filter['diff'] = abs(major_filter[column] - score)
+    score_filter = major_filter[major_filter['diff'] <= config["window"]]
+    if score_filter.empty:
+        return NO_SCORE, None
+    result = score_filter.sort_values(by=['match_priority', 'diff']).drop_duplicates(subset=list(config["unique"]))
+    return FOUND, result.head(config["result_count"])
+
+
+def queries(track, df, seed=0):
+    rng = random.Random(seed)
+    stems = load_index().stems
+    config = TRACKS[track]
+    low, high = config["score_range"]
+    scores = score_values(df[config["score_column"]]).tolist()
+    for _ in range(QUERIES_PER_TRACK):
+        major = rng.choice(stems)[:rng.randint(1, 4)]
+        if rng.random() < 0.7:
+            score = round(rng.uniform(low, high), 1)
+        else:
+            # 구간 경계에 걸리는 점수
+            score = round(rng.choice(scores) + rng.choice([-1, 1]) * config["window"], 3)
+        yield major, score
+
+
+@pytest.mark.parametrize("track", list(TRACKS))
+def test_search_matches_pandas_baseline(track):
+    config = TRACKS[track]
+    df = load_results(config["dataset"]).copy()
+    df[config["score_column"]] = score_values(df[config["score_column"]])
+    for col in ('대학명', '학과명', '전형명'):
+        df[col] = df[col].astype(str)
+    index = load_index()
+
+    mismatches = []
+    for major, score in queries(track, df):
+        related = list(dict.fromkeys([major] + index.lookup(major)))
+        status, expected = baseline(df, track, major, related, score)
+        result = search(track, major, related, score, ranking="distance")
+        if result.status != status or (status == FOUND and list(result.results.index) != list(expected.index)):
+            mismatches.append((major, score, status, result.status))
+    assert not mismatches
+
+
+@pytest.mark.parametrize("track", [track for track, config in TRACKS.items() if config["history_years"]])
+def test_history_matches_pandas_baseline(track):
+    config = TRACKS[track]
+    df = load_results(config["dataset"])
+    start_year, end_year = year_range(track)
+    index = load_index()
+    for major, score in list(queries(track, df, seed=1))[:30]:
+        result = search(track, major, list(dict.fromkeys([major] + index.lookup(major))), score)
+        if result.status != FOUND:
+            continue
+        history, offsets = result.history_rows()
+        for i, (_, row) in enumerate(result.results.iterrows()):
+            past = df[(df['대학명'] == row['대학명']) & (df['학과명'] == row['학과명'])
+                      & df['년도'].between(start_year, end_year)]
+            got = history.iloc[offsets[i]:offsets[i + 1]]
+            assert got['년도'].is_monotonic_decreasing
+            assert sorted(got.index) == sorted(past.index)
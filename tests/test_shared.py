@@ -0,0 +1,88 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from utils import data, shared, snapshot
+from utils.admissions import find
+from utils.result_cache import result_cache
+
+NAME = 'Regular_Results1'
+QUERIES = [("경영", 85.0), ("간호", 78.0), ("컴퓨터공학", 91.0)]
+
+
+def _restart(monkeypatch):
+    """새 프로세스처럼 데이터셋·색인·결과 캐시를 비운다."""
+    monkeypatch.setattr(data, "_cache", {})
+    monkeypatch.setattr(data, "_derived", {})
+    result_cache.clear()
+
+
+def _find_all():
+    results = [find('정시', major, score, None) for major, score in QUERIES]
+    return [(result.results, *result.history()) for result in results]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    shutil.copy(data.data_path(NAME), tmp_path / "data")
+    monkeypatch.setattr(data, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(data, "SNAPSHOT_DIR", str(tmp_path / "data" / "snapshot"))
+    monkeypatch.setattr(shared, "SHARED_DIR", str(tmp_path / "shared"))
+    _restart(monkeypatch)
+    yield
+    result_cache.clear()
+
+
+def _assert_same(actual, expected):
+    assert len(actual) == len(expected)
+    for (results, history, offsets), (expected_results, expected_history, expected_offsets) in zip(actual, expected):
+        pd.testing.assert_frame_equal(results, expected_results)
+        pd.testing.assert_frame_equal(history, expected_history)
+        assert list(offsets) == list(expected_offsets)
+
+
+def test_published_bundle_attaches_and_matches(workspace, monkeypatch, capsys):
+    expected = _find_all()
+    shared.publish([NAME])
+    _restart(monkeypatch)
+
+    df = data.load_results(NAME)
+    # 색인은 다시 만들지 않고 묶음에서 읽은 것을 쓰며, 큰 배열은 읽기 전용 mmap 을 가리킨다
+    keys = {key for dataset, key in data._derived if dataset == NAME}
+    assert {'score_index', 'history_index'} <= keys
+    assert not df['합격 백분위'].to_numpy().flags.writeable
+    _assert_same(_find_all(), expected)
+
+
+def test_stale_bundle_is_ignored(workspace, monkeypatch, capsys):
+    shared.publish([NAME])
+    csv_path = data.data_path(NAME)
+    bundle = shared.bundle_path(NAME)
+    assert shared.read_bundle(bundle, snapshot.file_hash(csv_path)) is not None
+
+    with monkeypatch.context() as patch:
+        patch.setattr(shared, "BUNDLE_VERSION", "stale")
+        assert shared.read_bundle(bundle, snapshot.file_hash(csv_path)) is None
+
+    # CSV 가 바뀌면 해시가 달라 묶음을 쓰지 않고 CSV(없으면 스냅샷 다음)를 읽는다
+    with open(csv_path, 'rb') as f:
+        last = f.read().splitlines()[-1]
+    with open(csv_path, 'ab') as f:
+        f.write(last.replace(last.split(b',')[0], "테스트대학".encode()) + b'\r\n')
+    source_hash = snapshot.file_hash(csv_path)
+    assert shared.read_bundle(bundle, source_hash) is None
+
+    _restart(monkeypatch)
+    df = data.load_results(NAME)
+    assert '테스트대학' in df['대학명'].cat.categories
+    assert not [key for dataset, key in data._derived if dataset == NAME]
+    expected = _find_all()
+
+    # 스냅샷이 새 CSV 와 맞으면 CSV 대신 스냅샷을 읽고, 검색 결과는 같다
+    snapshot.write_snapshot(data.snapshot_path(NAME), df, source_hash)
+    _restart(monkeypatch)
+    monkeypatch.setattr(data, "read_results", lambda path: pytest.fail("CSV 를 다시 읽었습니다"))
+    assert len(data.load_results(NAME)) == len(df)
+    _assert_same(_find_all(), expected)
@@ -0,0 +1,24 @@
+import json
+
+from utils.telemetry import Trace, read_log
+
+
+def test_disabled_by_default(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    with Trace("교과", path=path) as trace:
+        with trace.stage("search"):
+            pass
+    assert not (tmp_path / "log.jsonl").exists()
+
+
+def test_records_stages_and_counts(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    with Trace("교과", True, path, options=2) as trace:
+        with trace.scoped("정시.").stage("search"):
+            pass
+        trace.set(results=12)
+    record = json.loads((tmp_path / "log.jsonl").read_text(encoding="utf-8"))
+    assert record["page"] == "교과" and record["status"] == "ok"
+    assert set(record["stages"]) == {"정시.search"}
+    assert record["options"] == 2 and record["results"] == 12
+    assert read_log(path)["results"].tolist() == [12]
@@ -0,0 +1,68 @@
+from utils.topics import TopicParser, parse_topics
+
+RESPONSE = """다음은 추천 탐구 주제입니다.
+
+1. **[수초의 광합성 속도와 빛의 세기]**
+   - 핵심 개념: 광합성, 명반응, 광포화점
+   - 탐구 방법: 다음 순서로 실험을 진행합니다.
+     1. 수초를 준비합니다.
+     2. 전등과의 거리를 바꿔 가며 기포 수를 셉니다.
+     3. 결과를 그래프로 나타냅니다.
+2. **[효소 활성과 온도]**
+   - 핵심 개념: 효소, 활성화 에너지
+   - 탐구 방법: 카탈레이스 용액으로 온도별 산소 발생량을 비교합니다.
+
+※ 안전 수칙을 지켜 주세요.
+"""
+
+
+def test_nested_steps_stay_in_method():
+    topics = parse_topics(RESPONSE)
+    assert [title for title, _, _ in topics] == ["수초의 광합성 속도와 빛의 세기", "효소 활성과 온도"]
+    method = topics[0][2]
+    assert method.startswith("다음 순서로 실험을 진행합니다.")
+    assert "1. 수초를 준비합니다." in method
+    assert method.endswith("3. 결과를 그래프로 나타냅니다.")
+    assert "안전 수칙" not in topics[1][2]
+
+
+def test_unindented_steps_do_not_restart_topics():
+    text = RESPONSE.replace("     1. 수초", "1. 수초")
+    topics = parse_topics(text)
+    assert len(topics) == 2
+    assert "1. 수초를 준비합니다." in topics[0][2]
+    assert topics[0][2].endswith("3. 결과를 그래프로 나타냅니다.")
+
+
+def test_all_unindented_steps_stay_in_method():
+    text = RESPONSE.replace("     1. 수초", "1. 수초").replace("     2. 전등", "2. 전등").replace("     3. 결과", "3. 결과")
+    topics = parse_topics(text)
+    assert topics == parse_topics(RESPONSE)
+    assert topics[1] == ("효소 활성과 온도", "효소, 활성화 에너지", "카탈레이스 용액으로 온도별 산소 발생량을 비교합니다.")
+
+
+def test_heading_styles():
+    text = ("### 1) 주제명: 첫째\n- 핵심 개념: 가\n- 탐구 방법: 나\n"
+            "**2. 둘째**\n* **핵심 개념**: 다\n* **탐구 방법**: 라\n")
+    assert parse_topics(text) == [("첫째", "가", "나"), ("둘째", "다", "라")]
+
+
+def test_streaming_matches_whole_text():
+    parser = TopicParser()
+    streamed = []
+    for i in range(0, len(RESPONSE), 7):
+        streamed += parser.feed(RESPONSE[i:i + 7])
+    streamed += parser.close()
+    assert streamed == parse_topics(RESPONSE)
+
+
+def test_only_complete_results_are_stored(monkeypatch):
+    from utils import topics as module
+
+    stored = {}
+    monkeypatch.setattr(module.topic_cache, "set", stored.__setitem__)
+    full = [(f"주제 {i}", "개념", "방법") for i in range(module.TOPIC_COUNT)]
+    assert not module.store_topics("short", full[:-1])
+    assert not module.store_topics("empty", full[:-1] + [("주제", "개념", "")])
+    assert module.store_topics("full", full)
+    assert list(stored) == ["full"]
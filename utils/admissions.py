@@ -0,0 +1,380 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+
+from utils.chance import load_chance_model
+from utils.data import dataset_version, load_derived, score_values
+from utils.eligibility import COLUMN as ELIGIBILITY_COLUMN, load_eligibility, normalize_options
+from utils.history import load_history_index
+from utils.majors import find_related_majors, find_related_majors_many, normalize_major
+from utils.matcher import load_matcher
+from utils.result_cache import result_cache
+from utils.score_index import load_score_index
+from utils.telemetry import NO_TRACE
+
+# 전형별 검색 설정. 페이지는 이 설정의 키(교과/종합/정시/특별)만 넘기고 검색은 모두 search() 가 맡는다.
+#   dataset          utils.data 의 데이터셋 이름
+#   score_column     합격 점수 열 ('합격 등급' 은 낮을수록, '합격 백분위' 는 높을수록 좋은 성적)
+#   higher_is_better 점수 방향
+#   score_range      입력 가능한 점수 범위
+#   window           입력 점수와의 최대 차이
+#   history_years    보여줄 이력 연도 수. 검색 대상 연도는 데이터의 가장 최근 년도다 (year_range). 년도 열이 없는 데이터셋은 None
+#   result_count     보여줄 결과 수
+#   unique           같은 조합은 한 번만 보여준다
+#   filters          추가 조건 열. 지원자격은 bitmask 색인으로, 나머지는 str.contains 로 거른다
+#   score_step       결과 캐시(find)가 점수를 반올림하는 단위
+#   table_columns    table() 이 점수 앞에 보여주는 열
+TRACKS = {
+    "교과": {
+        "dataset": "Early_Results1",
+        "score_column": "합격 등급",
+        "higher_is_better": False,
+        "score_range": (1.0, 9.0),
+        "window": 0.5,
+        "history_years": 3,
+        "result_count": 12,
+        "unique": ("대학명", "학과명"),
+        "filters": (),
+        "score_step": 0.1,
+        "score_label": "70% 등급",
+        "score_format": "{:.2f}",
+        "table_columns": ("대학명", "학과명", "전형명"),
+    },
+    "종합": {
+        "dataset": "Early_Results2",
+        "score_column": "합격 등급",
+        "higher_is_better": False,
+        "score_range": (1.0, 9.0),
+        "window": 0.5,
+        "history_years": 3,
+        "result_count": 12,
+        "unique": ("대학명", "학과명"),
+        "filters": (),
+        "score_step": 0.1,
+        "score_label": "70% 등급",
+        "score_format": "{:.2f}",
+        "table_columns": ("대학명", "학과명", "전형명"),
+    },
+    "정시": {
+        "dataset": "Regular_Results1",
+        "score_column": "합격 백분위",
+        "higher_is_better": True,
+        "score_range": (0.0, 100.0),
+        "window": 5.0,
+        "history_years": 2,
+        "result_count": 12,
+        "unique": ("대학명", "학과명"),
+        "filters": (),
+        "score_step": 1.0,
+        "score_label": "70% 백분위",
+        "score_format": "{:.1f}",
+        "table_columns": ("대학명", "학과명", "전형명"),
+    },
+    "특별": {
+        "dataset": "Early_Results3",
+        "score_column": "합격 등급",
+        "higher_is_better": False,
+        "score_range": (1.0, 9.0),
+        "window": 0.8,
+        "history_years": None,
+        "result_count": 15,
+        "unique": ("대학명", "학과명", "전형명"),
+        "filters": ("지원자격",),
+        "score_step": 0.1,
+        "score_label": "70% 등급",
+        "score_format": "{:.2f}",
+        "table_columns": ("대학명", "학과명", "전형유형", "전형명"),
+    },
+}
+
+# 전형별 검색은 서로 독립이라 전형 수만큼의 스레드에서 동시에 돌린다 (numpy 연산은 GIL 을 놓는다)
+_executor = ThreadPoolExecutor(max_workers=len(TRACKS), thread_name_prefix="admissions")
+
+NO_MAJOR = "no_major"
+NO_SCORE = "no_score"
+FOUND = "found"
+
+
+class SearchResult:
+    """search() 결과.
+
+    status 가 NO_MAJOR 이면 전공(과 추가 조건)에 해당하는 데이터가 없고, NO_SCORE 이면 점수 구간 안에 결과가 없다.
+    FOUND 이면 results 에 (우선순위, 합격 가능성이 반반에 가까운 순) 결과 행이 들어 있고,
+    chance(합격 가능성 0~1)와 chance_label(안정/적정/소신) 열이 붙어 있다.
+    연도별 이력이 없는 전형(특별)은 합격 가능성을 추정할 근거가 없어 두 열 없이 점수 차이 순이다 (has_chance).
+    """
+
+    def __init__(self, track, major_input, related, status, results=None):
+        self.track = track
+        self.config = TRACKS[track]
+        self.major_input = major_input
+        self.related = related
+        self.status = status
+        self.results = results
+        self._history = None
+        self._history_rows = None
+
+    @property
+    def year(self):
+        return target_year(self.track)
+
+    @property
+    def has_chance(self):
+        return has_chance(self.track)
+
+    def display_related(self, limit=10):
+        """안내 문구에 보여줄 관련 학과 (입력 전공 제외)."""
+        return [m for m in self.related if m and m.lower() != self.major_input.lower()][:limit]
+
+    def history(self):
+        """결과 각각의 연도별 점수 이력. (표, offsets) 이며 i 번째 결과의 이력은 표.iloc[offsets[i]:offsets[i + 1]].
+
+        한 번 만든 이력은 결과와 함께 보관하므로 결과 캐시에서 꺼낸 결과는 다시 만들지 않는다.
+        """
+        if self._history is None:
+            history, offsets = self.history_rows()
+            label = self.config["score_label"]
+            table = history.rename(columns={self.config["score_column"]: label})
+            table['년도'] = table['년도'].astype(str)
+            table[label] = score_values(table[label]).map(self.config["score_format"].format)
+            self._history = table.set_index('년도'), offsets
+        return self._history
+
+    def history_rows(self):
+        """history() 의 바탕이 되는 원본 이력 (년도, 전형명, 점수 열만 남긴 행, offsets). 점수는 숫자 그대로다."""
+        if self._history_rows is None:
+            start_year, end_year = year_range(self.track)
+            history, offsets = load_history_index(self.config["dataset"]).lookup(self.results, start_year, end_year)
+            self._history_rows = history[['년도', '전형명', self.config["score_column"]]], offsets
+        return self._history_rows
+
+    def table(self):
+        """결과를 (설정의 table_columns, 점수, 구분) 표로. 점수는 설정의 표시 형식대로 문자열로 바꾼다."""
+        label = self.config["score_label"]
+        table = self.results[list(self.config["table_columns"])].astype(str)
+        table[label] = score_values(self.results[self.config["score_column"]]).map(self.config["score_format"].format)
+        if self.has_chance:
+            table['구분'] = self.results['chance_label']
+        return table.reset_index(drop=True)
+
+
+def year_range(track):
+    """(이력 시작 연도, 검색 대상 연도). 대상 연도는 데이터셋의 가장 최근 년도라서 새 연도를 추가하면 함께 바뀐다.
+
+    년도 열이 없는 전형은 None.
+    """
+    config = TRACKS[track]
+    if not config["history_years"]:
+        return None
+    latest = load_derived(config["dataset"], 'latest_year', lambda df: int(df['년도'].max()))
+    return latest - config["history_years"] + 1, latest
+
+
+def target_year(track):
+    years = year_range(track)
+    return years[1] if years else None
+
+
+def has_chance(track):
+    """합격 가능성·안정/적정/소신을 추정하는 전형인지. 연도별 합격선이 있어야 평균과 변동폭을 구할 수 있다."""
+    return bool(TRACKS[track]["history_years"])
+
+
+def _with_input(major_input, related):
+    if major_input not in related:
+        related = [major_input] + related
+    return list(dict.fromkeys(related))
+
+
+def related_majors(major_input, api_key, lookup="index", gpt_fallback=False):
+    """검색에 쓸 관련 학과 목록. 입력 전공을 맨 앞에 두고 중복은 뺀다. 여러 전형을 검색할 때 한 번만 구하면 된다."""
+    return _with_input(major_input, find_related_majors(major_input, api_key, lookup, gpt_fallback))
+
+
+def related_majors_many(major_inputs, api_key, lookup="index", gpt_fallback=False, errors=None):
+    """여러 전공의 related_majors 결과 {입력: 목록}. GPT 에 물어야 하는 전공은 동시에 묻는다.
+
+    errors 에 dict 를 넘기면 관련 학과를 구하지 못한 전공은 결과에서 빼고 {입력: 예외} 로 채운다.
+    """
+    found = find_related_majors_many(major_inputs, api_key, lookup, gpt_fallback, errors)
+    return {major_input: _with_input(major_input, related) for major_input, related in found.items()}
+
+
+def _filter_mask(dataset, column, value):
+    if column == ELIGIBILITY_COLUMN:
+        return load_eligibility(dataset, column).mask(value)
+    return load_derived(
+        dataset, ('contains', column, value),
+        lambda df: df[column].str.contains(value, case=False, na=False).to_numpy()
+    )
+
+
+def search(track, major_input, related, score, filters=None, ranking="chance", trace=NO_TRACE):
+    """track 전형에서 related 학과 중 score 와 가까운 대학을 찾는다.
+
+    filters 는 {열: 값} 이며 설정의 filters 에 있는 열만 쓸 수 있다 (예: 특별 전형의 {'지원자격': '농어촌'}).
+    지원자격에는 여러 자격의 목록도 줄 수 있으며 그중 하나라도 지원할 수 있는 전형을 찾는다.
+    점수 구간 안의 후보는 ranking="chance" 이면 연도별 추세와 변동폭으로 추정한 합격 가능성이 반반에 가까운 순,
+    "distance" 이면 최근 합격 점수와의 차이 순으로 고른다. 연도별 이력이 없는 전형은 항상 "distance" 이다.
+    trace(utils.telemetry.Trace)를 넘기면 load/filter/rank 단계 시간을 기록한다.
+    """
+    config = TRACKS[track]
+    dataset = config["dataset"]
+    with trace.stage("load"):
+        matcher = load_matcher(dataset)
+        score_index = load_score_index(dataset)
+        model = load_chance_model(dataset, config["higher_is_better"]) if has_chance(track) else None
+        masks = [_filter_mask(dataset, column, value) for column, value in (filters or {}).items()
+                 if column in config["filters"] and value]
+    year = target_year(track)
+
+    def select(rows):
+        rows = score_index.select(rows, major_mask)
+        for mask in masks:
+            rows = rows[mask[rows]]
+        return rows
+
+    with trace.stage("filter"):
+        major_mask = matcher.match(related)
+        if not select(score_index.rows(year)).size:
+            trace.set(result=NO_MAJOR)
+            return SearchResult(track, major_input, related, NO_MAJOR)
+
+        rows = select(score_index.window(score, config["window"], year))
+        if not rows.size:
+            trace.set(result=NO_SCORE)
+            return SearchResult(track, major_input, related, NO_SCORE)
+
+    with trace.stage("rank"):
+        order = np.abs(model.z(rows, score)) if model is not None and ranking == "chance" else None
+        results = score_index.rank(rows, matcher.match([major_input]), score, config["result_count"],
+                                   unique=config["unique"], order=order)
+        if model is not None:
+            results['chance'], results['chance_label'] = model.chance(results.index.to_numpy(), score)
+    trace.set(result=FOUND, candidates=int(rows.size), results=len(results))
+    return SearchResult(track, major_input, related, FOUND, results)
+
+
+def search_tracks(major_input, related, scores, filters=None, trace=NO_TRACE):
+    """여러 전형을 한 번에 검색한다. scores 는 {전형: 점수} 이며 점수가 주어진 전형만 검색한다.
+
+    관련 학과(related)는 한 번만 구해 모든 전형에 쓰고, 전형별 검색은 스레드 풀에서 동시에 실행한다.
+    {전형: SearchResult} 를 TRACKS 순서로 반환한다. trace 에는 '교과.filter' 처럼 전형별로 기록한다.
+    """
+    futures = {track: _executor.submit(search, track, major_input, related, score, filters,
+                                       trace=trace.scoped(f"{track}."))
+               for track, score in scores.items() if score is not None}
+    return {track: futures[track].result() for track in TRACKS if track in futures}
+
+
+def warm_up(tracks=TRACKS):
+    """전형들의 데이터와 검색 색인을 미리 읽어 둔다. 서버를 띄울 때 부르면 첫 요청이 느려지지 않는다."""
+    for track in tracks:
+        config = TRACKS[track]
+        dataset = config["dataset"]
+        load_matcher(dataset)
+        load_score_index(dataset)
+        if config["history_years"]:
+            load_chance_model(dataset, config["higher_is_better"])
+            load_history_index(dataset)
+        for column in config["filters"]:
+            if column == ELIGIBILITY_COLUMN:
+                load_eligibility(dataset, column)
+
+
+def quantize_score(track, score):
+    """점수를 설정의 score_step 단위로 반올림한다 (등급 0.1, 백분위 1). .5 는 올린다.
+
+    입력한 그대로의 십진수로 반올림한다. 부동소수점으로 나누면 1.15 / 0.1 이 11.499… 가 되어 1.1 로 내려간다.
+    """
+    step = Decimal(str(TRACKS[track]["score_step"]))
+    return float((Decimal(str(score)) / step).quantize(Decimal(1), ROUND_HALF_UP) * step)
+
+
+def _cache_key(track, major_input, score, filters, lookup, gpt_fallback):
+    config = TRACKS[track]
+    conditions = tuple(sorted(
+        (column, normalize_options(value) if column == ELIGIBILITY_COLUMN else str(value).lower())
+        for column, value in (filters or {}).items() if column in config["filters"] and value
+    ))
+    return (config["dataset"], dataset_version(config["dataset"]), track, lookup, gpt_fallback,
+            normalize_major(major_input), score, conditions)
+
+
+def _cache_result(key, result, trace):
+    # 캐시된 결과는 수정하지 않으므로 이력 표까지 만들어 둔 뒤 넣어야 캐시 크기에 함께 잡힌다
+    if result.status == FOUND and result.config["history_years"]:
+        with trace.stage("history"):
+            result.history()
+    result_cache.set(key, result)
+
+
+def find(track, major_input, score, api_key, lookup="index", gpt_fallback=False, filters=None, trace=NO_TRACE,
+         related=None):
+    """관련 학과 찾기와 search() 를 결과 캐시를 거쳐 한 번에 한다. 검색 페이지는 이 함수를 쓴다.
+
+    score 는 quantize_score() 로 반올림해 검색하므로 (전형, 전공, 반올림한 점수, 조건) 이 같으면 캐시된 결과를 그대로 돌려준다.
+    데이터셋 파일이 바뀌면 그 데이터셋의 캐시는 비워진다. 캐시된 결과는 여러 세션이 공유하므로 수정하지 말 것.
+    연도별 이력이 있는 전형은 history() 표도 만들어 결과와 함께 캐시한다.
+    trace 에는 캐시 적중 여부(result_cache_hit)와, 캐시에 없을 때 expand, search() 와 history 의 단계 시간을 남긴다.
+    related 에 같은 lookup 으로 미리 구한 related_majors() 결과를 넘기면 관련 학과를 다시 구하지 않는다.
+    """
+    score = quantize_score(track, score)
+    key = _cache_key(track, major_input, score, filters, lookup, gpt_fallback)
+    result = result_cache.get(key)
+    trace.set(result_cache_hit=result is not None)
+    if result is None:
+        if related is None:
+            with trace.stage("expand"):
+                related = related_majors(major_input, api_key, lookup, gpt_fallback)
+        result = search(track, major_input, related, score, filters, trace=trace)
+        _cache_result(key, result, trace)
+    return result
+
+
+def find_tracks(major_input, scores, api_key, lookup="index", gpt_fallback=False, filters=None, trace=NO_TRACE):
+    """find() 의 여러 전형 버전. 캐시에 없는 전형만 관련 학과를 한 번 구해 search_tracks() 로 검색한다.
+
+    trace 에는 전형별 history 단계를 '교과.history' 처럼 남긴다.
+    """
+    scores = {track: quantize_score(track, score) for track, score in scores.items() if score is not None}
+    keys = {track: _cache_key(track, major_input, score, filters, lookup, gpt_fallback) for track, score in scores.items()}
+    results = {track: result_cache.get(key) for track, key in keys.items()}
+    missing = {track: scores[track] for track, result in results.items() if result is None}
+    trace.set(result_cache_hit=not missing)
+    if missing:
+        with trace.stage("expand"):
+            related = related_majors(major_input, api_key, lookup, gpt_fallback)
+        for track, result in search_tracks(major_input, related, missing, filters, trace).items():
+            _cache_result(keys[track], result, trace.scoped(f"{track}."))
+            results[track] = result
+    return {track: results[track] for track in TRACKS if track in results}
+
+
+# merge_results 의 열 (전형 열 제외). 전형마다 다른 table_columns 는 공통 열만 남긴다
+MERGED_COLUMNS = ['대학명', '학과명', '전형명', '70% 점수', '구분']
+
+
+def merge_results(results):
+    """search_tracks 결과를 하나의 표로 합친다.
+
+    점수 척도가 전형마다 달라서 (입력 전공 우선순위, 합격 가능성이 반반에 가까운 순) 으로 정렬한다.
+    합격 가능성이 없는 전형(특별)의 행은 같은 우선순위 안에서 뒤에 자기 순서대로 두고 구분은 '-' 로 채운다.
+    """
+    frames = []
+    for track, result in results.items():
+        if result.status != FOUND:
+            continue
+        table = result.table().rename(columns={result.config["score_label"]: '70% 점수'})
+        table = table[[c for c in table.columns if c in MERGED_COLUMNS]]
+        table.insert(0, '전형', track)
+        table['_priority'] = result.results['match_priority'].to_numpy()
+        table['_distance'] = np.abs(result.results['chance'].to_numpy() - 0.5) if result.has_chance else np.nan
+        frames.append(table)
+    if not frames:
+        return pd.DataFrame(columns=['전형'] + MERGED_COLUMNS)
+    merged = pd.concat(frames, ignore_index=True).sort_values(['_priority', '_distance'], kind='stable')
+    merged['구분'] = merged['구분'].fillna('-') if '구분' in merged.columns else '-'
+    return merged.drop(columns=['_priority', '_distance']).reset_index(drop=True)
@@ -0,0 +1,230 @@
+"""검색 페이지(3~6)와 같은 지원 대학 검색을 JSON 으로 돌려주는 HTTP API.
+
+    python -m utils.api --port 8000 [--lookup gpt] [--gpt-fallback] [--log]
+
+    GET  /health
+    GET  /tracks
+    GET  /search?track=교과&major=컴퓨터공학&score=2.3
+    POST /search   {"track": "특별", "major": "간호", "score": 3.1, "eligibility": ["농어촌", "한부모"]}
+    POST /search   {"queries": [{...}, {...}]}
+
+질의 하나의 결과는 {"track", "major", "score", "status", "related", "rows"} 이며
+rows 의 각 행은 {"university", "department", "admission", "score", "chance", "label", "history"} 이다.
+연도별 이력이 없는 전형(특별)은 합격 가능성을 추정하지 않아 chance, label 이 null 이고 점수 차이 순이다.
+history 는 [[년도, 전형명, 점수], ...] (연도 내림차순)이고 연도 열이 없는 전형(특별)은 빈 리스트다.
+잘못된 질의는 그 질의 자리에 {"error": ...} 를 넣고 나머지는 그대로 검색한다.
+
+페이지와 같은 프로세스 캐시(load_derived 색인, 결과 캐시, 관련 학과 캐시)를 쓴다.
+HIGHAI_API_TOKEN 을 설정하면 Authorization: Bearer <토큰> 헤더가 있는 요청만 받는다.
+"""
+import argparse
+import hmac
+import os
+
+import orjson
+from flask import Flask, request
+
+from utils.admissions import FOUND, TRACKS, find, related_majors_many, warm_up, year_range
+from utils.data import score_values
+from utils.eligibility import load_eligibility, normalize_options
+from utils.majors import normalize_major
+from utils.telemetry import NO_TRACE, Trace
+
+# 요청 하나에 담을 수 있는 최대 질의 수
+MAX_QUERIES = 200
+
+API_TOKEN = os.environ.get("HIGHAI_API_TOKEN")
+
+
+class QueryError(ValueError):
+    pass
+
+
+def parse_query(query):
+    """요청의 질의 dict 를 검사해 (track, major, score, filters) 로. 잘못된 값이면 QueryError."""
+    if not isinstance(query, dict):
+        raise QueryError("질의는 JSON 객체여야 합니다.")
+    track = query.get("track")
+    if track not in TRACKS:
+        raise QueryError(f"track 은 {', '.join(TRACKS)} 중 하나여야 합니다.")
+    major = query.get("major")
+    if major is not None and not isinstance(major, str):
+        raise QueryError("major 는 문자열이어야 합니다.")
+    major = " ".join((major or "").split())
+    if not major:
+        raise QueryError("major 가 비어 있습니다.")
+
+    low, high = TRACKS[track]["score_range"]
+    score = query.get("score")
+    if isinstance(score, bool):
+        raise QueryError("score 가 숫자가 아닙니다.")
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        raise QueryError("score 가 숫자가 아닙니다.") from None
+    if not (low <= score <= high):
+        raise QueryError(f"score 는 {low}~{high} 범위여야 합니다.")
+
+    filters = None
+    if TRACKS[track]["filters"]:
+        filters = {'지원자격': _parse_eligibility(track, query.get("eligibility"))}
+    return track, major, score, filters
+
+
+def _parse_eligibility(track, eligibility):
+    """eligibility(문자열 또는 문자열 목록)를 표준 자격 이름 목록으로. 데이터에 없는 자격이 있으면 QueryError."""
+    if isinstance(eligibility, list) and all(isinstance(name, str) for name in eligibility):
+        options = normalize_options(" ".join(name.split()) for name in eligibility)
+    elif isinstance(eligibility, str):
+        options = normalize_options(eligibility)
+    elif eligibility is None:
+        options = ()
+    else:
+        raise QueryError("eligibility 는 문자열이나 문자열 목록이어야 합니다.")
+    options = [name for name in options if name]
+    if not options:
+        raise QueryError(f"{track} 전형은 eligibility(지원자격)가 필요합니다.")
+
+    names = load_eligibility(TRACKS[track]["dataset"]).names
+    unknown = [name for name in options if name not in names]
+    if unknown:
+        raise QueryError(f"알 수 없는 eligibility 입니다: {', '.join(unknown)} (가능한 값: {', '.join(names)})")
+    return options
+
+
+def result_json(result, major, score):
+    """SearchResult 를 응답용 dict 로. 결과 캐시에서 꺼낸 결과일 수 있으므로 major, score 는 질의의 값을 쓴다."""
+    config = result.config
+    payload = {
+        "track": result.track,
+        "major": major,
+        "score": score,
+        "status": result.status,
+        "related": result.display_related(),
+        "rows": [],
+    }
+    if result.status != FOUND:
+        return payload
+
+    df = result.results
+    histories = [[] for _ in range(len(df))]
+    chances, labels = [None] * len(df), [None] * len(df)
+    if result.has_chance:
+        chances, labels = [round(chance, 3) for chance in df['chance'].tolist()], df['chance_label'].tolist()
+    if config["history_years"]:
+        history, offsets = result.history_rows()
+        entries = list(zip(history['년도'].tolist(), history['전형명'].astype(str).tolist(),
+                           score_values(history[config["score_column"]]).tolist()))
+        histories = [entries[offsets[i]:offsets[i + 1]] for i in range(len(df))]
+
+    payload["rows"] = [
+        {"university": university, "department": department, "admission": admission, "score": row_score,
+         "chance": chance, "label": label, "history": history}
+        for university, department, admission, row_score, chance, label, history in zip(
+            df['대학명'].astype(str).tolist(), df['학과명'].astype(str).tolist(), df['전형명'].astype(str).tolist(),
+            score_values(df[config["score_column"]]).tolist(), chances, labels,
+            histories,
+        )
+    ]
+    return payload
+
+
+def run_queries(queries, api_key, lookup="index", gpt_fallback=False, trace=NO_TRACE):
+    """질의 목록을 검색해 같은 순서의 결과 dict 목록으로. 질의마다 find() 를 거치므로 결과 캐시를 공유한다."""
+    parsed = []
+    for query in queries:
+        try:
+            parsed.append(parse_query(query))
+        except QueryError as e:
+            parsed.append(e)
+
+    # 여러 전공을 묻는 요청은 관련 학과를 먼저 한꺼번에 구해 둔다 (GPT 에 물어야 하는 전공은 동시에)
+    majors = {normalize_major(p[1]): p[1] for p in parsed if not isinstance(p, QueryError)}
+    if len(majors) > 1:
+        with trace.stage("expand"):
+            related_majors_many(list(majors.values()), api_key, lookup, gpt_fallback)
+
+    responses = []
+    for p in parsed:
+        if isinstance(p, QueryError):
+            responses.append({"error": str(p)})
+            continue
+        track, major, score, filters = p
+        result = find(track, major, score, api_key, lookup, gpt_fallback, filters, trace=trace)
+        with trace.stage("render"):
+            responses.append(result_json(result, major, score))
+    return responses
+
+
+def create_app(api_key=None, lookup="index", gpt_fallback=False, log_requests=False, token=API_TOKEN):
+    app = Flask(__name__)
+
+    def respond(payload, status=200):
+        return app.response_class(orjson.dumps(payload), status=status, mimetype="application/json")
+
+    @app.before_request
+    def check_token():
+        if token and request.path != "/health":
+            supplied = request.headers.get("Authorization", "").removeprefix("Bearer ")
+            if not hmac.compare_digest(supplied, token):
+                return respond({"error": "인증 토큰이 올바르지 않습니다."}, 401)
+
+    @app.get("/health")
+    def health():
+        return respond({"status": "ok"})
+
+    @app.get("/tracks")
+    def tracks():
+        return respond({
+            track: {
+                "score_column": config["score_column"],
+                "higher_is_better": config["higher_is_better"],
+                "score_range": config["score_range"],
+                "years": year_range(track),
+                "eligibility": load_eligibility(config["dataset"]).names if config["filters"] else [],
+            }
+            for track, config in TRACKS.items()
+        })
+
+    @app.route("/search", methods=["GET", "POST"])
+    def search():
+        if request.method == "GET":
+            query = request.args.to_dict()
+            if "eligibility" in query:
+                query["eligibility"] = request.args.getlist("eligibility")
+            body = query
+        else:
+            try:
+                body = orjson.loads(request.get_data())
+            except orjson.JSONDecodeError:
+                return respond({"error": "요청 본문이 올바른 JSON 이 아닙니다."}, 400)
+
+        batch = isinstance(body, dict) and "queries" in body
+        queries = body["queries"] if batch else [body]
+        if not isinstance(queries, list) or not queries:
+            return respond({"error": "queries 는 비어 있지 않은 목록이어야 합니다."}, 400)
+        if len(queries) > MAX_QUERIES:
+            return respond({"error": f"요청 하나에 질의는 {MAX_QUERIES}개까지입니다."}, 413)
+
+        with Trace("API", log_requests, queries=len(queries)) as trace:
+            results = run_queries(queries, api_key, lookup, gpt_fallback, trace)
+            trace.set(errors=sum("error" in r for r in results))
+        if batch:
+            return respond({"results": results})
+        return respond(results[0], 400 if "error" in results[0] else 200)
+
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="지원 대학 검색 JSON API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--lookup", default="index", choices=["index", "gpt"])
+    parser.add_argument("--gpt-fallback", action="store_true")
+    parser.add_argument("--log", action="store_true", help="요청 로그(utils.telemetry, 시간·상태·개수만)를 남긴다")
+    args = parser.parse_args()
+
+    warm_up()
+    app = create_app(os.environ.get("OPENAI_API_KEY"), args.lookup, args.gpt_fallback, args.log)
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,241 @@
+import argparse
+import csv
+import importlib.util
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+from utils.admissions import FOUND, NO_MAJOR, TRACKS, find, quantize_score, related_majors_many
+from utils.data import score_values
+from utils.eligibility import parse_eligibility
+from utils.majors import normalize_major
+
+MAJOR_COLUMN = '희망 전공'
+GRADE_COLUMN = '내신 등급'
+PERCENTILE_COLUMN = '모의고사 백분위'
+OPTION_COLUMN = '지원자격'
+
+COLUMN_ALIASES = {
+    '전공': MAJOR_COLUMN,
+    '희망전공': MAJOR_COLUMN,
+    '내신': GRADE_COLUMN,
+    '내신등급': GRADE_COLUMN,
+    '백분위': PERCENTILE_COLUMN,
+    '모의고사백분위': PERCENTILE_COLUMN,
+    '모의고사 백분위 평균': PERCENTILE_COLUMN,
+    '지원 자격': OPTION_COLUMN,
+}
+
+# 전형별로 쓰는 입력 점수 열. 특별 전형은 지원자격이 있는 학생만 검색한다.
+TRACK_SCORES = {"교과": GRADE_COLUMN, "종합": GRADE_COLUMN, "정시": PERCENTILE_COLUMN, "특별": GRADE_COLUMN}
+
+# 결과 열. 학생 열(이름, 반, 비고 등)과 이름이 겹쳐 덮어쓰지 않도록 앞에 RESULT_PREFIX 를 붙인다
+RESULT_PREFIX = '추천 '
+RESULT_COLUMNS = [RESULT_PREFIX + c for c in ('전형', '순위', '대학명', '학과명', '전형명', '70% 점수', '구분', '비고')]
+
+EXCEL_AVAILABLE = importlib.util.find_spec("openpyxl") is not None
+
+
+def read_students(source):
+    """학생 목록 CSV (UTF-8 또는 엑셀에서 저장한 CP949). 열 이름의 흔한 변형은 표준 이름으로 바꾼다.
+
+    희망 전공 열과, 내신 등급·모의고사 백분위 중 하나 이상의 열이 있어야 한다. 나머지 열(이름, 반 등)은 그대로 둔다.
+    """
+    for encoding in ('utf-8-sig', 'cp949'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        try:
+            students = pd.read_csv(source, dtype=str, encoding=encoding, keep_default_na=False)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError("CSV 파일의 인코딩을 읽을 수 없습니다. UTF-8 또는 CP949 로 저장해주세요.")
+
+    students.columns = [COLUMN_ALIASES.get(str(c).strip(), str(c).strip()) for c in students.columns]
+    if MAJOR_COLUMN not in students.columns:
+        raise ValueError(f"'{MAJOR_COLUMN}' 열이 없습니다.")
+    if GRADE_COLUMN not in students.columns and PERCENTILE_COLUMN not in students.columns:
+        raise ValueError(f"'{GRADE_COLUMN}' 또는 '{PERCENTILE_COLUMN}' 열이 필요합니다.")
+    reserved = [c for c in students.columns if c in RESULT_COLUMNS]
+    if reserved:
+        raise ValueError(f"결과 열과 이름이 같은 열이 있습니다: {', '.join(reserved)}")
+    for column in (GRADE_COLUMN, PERCENTILE_COLUMN, OPTION_COLUMN):
+        if column not in students.columns:
+            students[column] = ""
+    return students
+
+
+def _parse_score(text, column, track):
+    """(점수, 오류 문구). 빈 칸이면 (None, None)."""
+    text = str(text).strip()
+    if not text:
+        return None, None
+    low, high = TRACKS[track]["score_range"]
+    try:
+        score = float(text)
+    except ValueError:
+        return None, f"{column} '{text}' 이(가) 숫자가 아닙니다."
+    if not (low <= score <= high):
+        return None, f"{column} '{text}' 이(가) {low}~{high} 범위를 벗어났습니다."
+    return score, None
+
+
+def _result_row(track, rank='', university='', major='', admission='', score='', label='', note=''):
+    return dict(zip(RESULT_COLUMNS, (track, rank, university, major, admission, score, label, note)))
+
+
+def _note_row(track, note):
+    return _result_row(track, note=note)
+
+
+def _track_rows(track, result):
+    if result.status == NO_MAJOR:
+        return [_note_row(track, "유사한 전공의 입시 데이터가 없습니다.")]
+    if result.status != FOUND:
+        return [_note_row(track, f"점수 차이 {TRACKS[track]['window']} 이내의 대학이 없습니다.")]
+    config, results = result.config, result.results
+    scores = score_values(results[config["score_column"]]).map(config["score_format"].format)
+    labels = results['chance_label'] if result.has_chance else [''] * len(results)
+    return [
+        _result_row(track, rank, *row)
+        for rank, row in enumerate(zip(results['대학명'], results['학과명'], results['전형명'], scores, labels), 1)
+    ]
+
+
+def run_batch(students, api_key, lookup="index", gpt_fallback=False, progress=None, stats=None):
+    """read_students 결과의 학생마다 (행 위치, 추천 결과 행 목록) 을 yield 한다. 각 행은 학생 열 + RESULT_COLUMNS 의 dict.
+
+    관련 학과는 정규화한 전공명마다 한 번만 미리 구해 두고(GPT 에 물어야 하는 전공은 한꺼번에 동시에) find() 에 넘긴다.
+    GPT 가 빈 목록을 주어도 다시 묻지 않으며, 재시도 후에도 관련 학과를 구하지 못한 전공은 그 학생들에게 안내 행만 남기고
+    나머지 학생은 계속 검색한다. 검색은 페이지·API 와 같은 find() 를 거치므로 점수 반올림과 결과 캐시를 공유한다.
+    같은 (전형, 전공, 반올림한 점수, 지원자격) 의 결과 행은 한 번만 만든다.
+    progress(완료 학생 수, 전체 학생 수) 로 진행 상황을, stats 에 처리량을 채운다.
+    지원자격은 '농어촌, 기초생활' 처럼 여러 개를 적을 수 있으며 그중 하나라도 지원할 수 있는 특별 전형을 찾는다.
+    """
+    stats = {} if stats is None else stats
+    total = len(students)
+    start = time.perf_counter()
+
+    majors = {}
+    for major in students[MAJOR_COLUMN]:
+        major = " ".join(major.split())
+        if major:
+            majors.setdefault(normalize_major(major), major)
+    errors = {}
+    related = related_majors_many(list(majors.values()), api_key, lookup, gpt_fallback, errors)
+    related = {normalize_major(major_input): found for major_input, found in related.items()}
+    stats.update(students=total, unique_majors=len(majors), expand_errors=len(errors),
+                 expand_time=time.perf_counter() - start)
+
+    searched = {}
+    rows = 0
+    search_start = time.perf_counter()
+    for position, student in enumerate(students.to_dict('records')):
+        major_input = " ".join(student[MAJOR_COLUMN].split())
+        major_key = normalize_major(major_input)
+        options = tuple(parse_eligibility(student[OPTION_COLUMN]))
+        track_rows = []
+        if not major_input:
+            track_rows.append(_note_row('', f"{MAJOR_COLUMN}이 비어 있습니다."))
+        elif major_key not in related:
+            track_rows.append(_note_row('', "관련 학과를 찾는 중 오류가 났습니다. 잠시 후 다시 시도해주세요."))
+        else:
+            for track, column in TRACK_SCORES.items():
+                if track == "특별" and not options:
+                    continue
+                score, error = _parse_score(student[column], column, track)
+                if error:
+                    track_rows.append(_note_row(track, error))
+                if score is None:
+                    continue
+                key = (track, major_key, quantize_score(track, score),
+                       options if track == "특별" else ())
+                if key not in searched:
+                    filters = {OPTION_COLUMN: list(options)} if track == "특별" else None
+                    result = find(track, major_input, score, api_key, lookup, gpt_fallback, filters,
+                                  related=related[major_key])
+                    searched[key] = _track_rows(track, result)
+                track_rows += searched[key]
+            if not track_rows:
+                track_rows.append(_note_row('', "검색할 점수가 없습니다."))
+
+        rows += len(track_rows)
+        if progress is not None:
+            progress(position + 1, total)
+        yield position, [{**student, **row} for row in track_rows]
+
+    elapsed = time.perf_counter() - start
+    stats.update(
+        rows=rows,
+        searches=len(searched),
+        search_time=time.perf_counter() - search_start,
+        elapsed=elapsed,
+        students_per_sec=total / elapsed if elapsed else 0.0,
+    )
+
+
+def output_columns(students):
+    return list(dict.fromkeys(list(students.columns) + RESULT_COLUMNS))
+
+
+def write_csv(chunks, path, columns):
+    """chunks(행 목록들)를 받는 대로 path 에 이어 쓴다 (엑셀에서 바로 열리도록 UTF-8 BOM)."""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+
+def to_frame(chunks, columns):
+    return pd.DataFrame([row for chunk in chunks for row in chunk], columns=columns)
+
+
+def to_excel(df):
+    """DataFrame 을 xlsx 바이트로. openpyxl 이 필요하다."""
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False, engine='openpyxl')
+    return buffer.getvalue()
+
+
+def format_stats(stats):
+    return (f"학생 {stats['students']}명 · 고유 전공 {stats['unique_majors']}개 · 검색 {stats['searches']}회 · "
+            f"결과 {stats['rows']}행 · {stats['elapsed']:.1f}초 ({stats['students_per_sec']:.1f}명/초, "
+            f"전공 확장 {stats['expand_time']:.1f}초)"
+            + (f" · 관련 학과를 찾지 못한 전공 {stats['expand_errors']}개" if stats.get('expand_errors') else ""))
+
+
+if __name__ == '__main__':
+    # python -m utils.batch students.csv results.csv [--xlsx results.xlsx] [--lookup gpt] [--gpt-fallback]
+    parser = argparse.ArgumentParser(description="학생 목록 CSV 로 전형별 지원 대학을 일괄 추천한다.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--xlsx", help="엑셀 파일도 함께 저장 (openpyxl 필요)")
+    parser.add_argument("--lookup", default="index", choices=["index", "gpt"])
+    parser.add_argument("--gpt-fallback", action="store_true")
+    args = parser.parse_args()
+    if args.xlsx and not EXCEL_AVAILABLE:
+        sys.exit("--xlsx 를 쓰려면 openpyxl 을 설치해야 합니다.")
+
+    students = read_students(args.input)
+    stats = {}
+
+    def report(done, total):
+        if done % 50 == 0 or done == total:
+            print(f"{done}/{total}", file=sys.stderr)
+
+    chunks = (chunk for _, chunk in run_batch(students, os.environ.get("OPENAI_API_KEY"), args.lookup,
+                                              args.gpt_fallback, report, stats))
+    columns = output_columns(students)
+    if args.xlsx:
+        results = list(chunks)
+        write_csv(results, args.output, columns)
+        with open(args.xlsx, 'wb') as f:
+            f.write(to_excel(to_frame(results, columns)))
+    else:
+        write_csv(chunks, args.output, columns)
+    print(format_stats(stats), file=sys.stderr)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from utils.data import group_codes, load_derived, score_column, score_values
+
+KEYS = ('대학명', '학과명', '전형명')
+
+# 예상 합격선에 반영할 추세(기울기) 비율. 2023-2024 로 2025 를 예측해 보면 추세를 외삽할수록 오차가 커져서
+# (합격선이 평균으로 돌아가는 경향) 기본값은 0 이다. 기울기는 stats() 로 볼 수 있다.
+TREND_WEIGHT = 0.0
+# 합격 가능성(0~1) 기준. 이 이상이면 안정, 그 아래로 적정, LOW 미만이면 소신
+SAFE = 0.65
+LOW = 0.35
+LABELS = np.array(['소신', '적정', '안정'])
+
+
+class ChanceModel:
+    """(대학명, 학과명, 전형명) 별 연도별 합격 점수 통계와 합격 가능성 추정.
+
+    그룹마다 평균(mean), 연도에 대한 기울기(slope), 연도 간 표준편차(volatility)를 한 번에 계산해 두고,
+    다음 입시 연도의 예상 합격선 = 평균 + TREND_WEIGHT * 기울기 * (다음 연도 - 평균 연도) 로 본다.
+    합격 가능성은 (학생 점수 - 예상 합격선) / 변동폭 의 로지스틱 근사(정규분포 CDF)이다.
+    변동폭은 volatility 와 데이터셋 전체의 전형적인 예측 오차(prior)를 합친 값이라 한 해치 데이터만 있는 그룹도 쓸 수 있다.
+    prior 는 그룹마다 최근 연도 점수를 나머지 연도 평균으로 예측했을 때의 오차 중앙값으로 정한다.
+    """
+
+    def __init__(self, df, higher_is_better=False, keys=KEYS, year_col='년도'):
+        self.higher_is_better = higher_is_better
+        # group_codes 는 범주 코드를 곱해 만든 희소한 키라서 0..그룹 수-1 로 다시 매긴다
+        _, self.group = np.unique(group_codes(df, keys), return_inverse=True)
+        scores = score_values(df[score_column(df)]).to_numpy()
+        years = df[year_col].to_numpy().astype(np.float64) if year_col in df.columns else np.zeros(len(df))
+
+        n = np.bincount(self.group).astype(np.float64)
+        size = len(n)
+        mean_x = np.bincount(self.group, years, size) / n
+        mean_y = np.bincount(self.group, scores, size) / n
+        var_x = np.bincount(self.group, years * years, size) / n - mean_x ** 2
+        var_y = np.bincount(self.group, scores * scores, size) / n - mean_y ** 2
+        cov = np.bincount(self.group, years * scores, size) / n - mean_x * mean_y
+
+        self.count = n
+        self.mean = mean_y
+        self.slope = np.where(var_x > 1e-9, cov / np.where(var_x > 1e-9, var_x, 1.0), 0.0)
+        self.volatility = np.sqrt(np.maximum(var_y, 0.0))
+
+        target_year = years.max() + 1 if year_col in df.columns else 0.0
+        self.expected = mean_y + TREND_WEIGHT * self.slope * (target_year - mean_x)
+
+        self.prior = self._prior(scores, years, n, mean_y)
+        self.sigma = np.sqrt(self.volatility ** 2 + self.prior ** 2)
+
+    def _prior(self, scores, years, n, mean_y):
+        order = np.lexsort((years, self.group))
+        grouped = self.group[order]
+        latest = order[np.r_[grouped[1:] != grouped[:-1], True]]
+        group = self.group[latest]
+        rest = n[group] - 1
+        has_rest = rest > 0
+        if not has_rest.any():
+            return float(np.std(scores)) * 0.1 or 1e-3
+        rest_mean = (mean_y[group] * n[group] - scores[latest])[has_rest] / rest[has_rest]
+        # 정규분포라면 |오차| 중앙값 * 1.4826 이 표준편차
+        return float(np.median(np.abs(scores[latest][has_rest] - rest_mean)) * 1.4826) or 1e-3
+
+    def z(self, rows, score):
+        """rows(df 의 행 위치)에 대해 학생 점수가 예상 합격선보다 변동폭 몇 배만큼 유리한지."""
+        group = self.group[rows]
+        margin = score - self.expected[group] if self.higher_is_better else self.expected[group] - score
+        return margin / self.sigma[group]
+
+    def chance(self, rows, score):
+        """(합격 가능성, 안정/적정/소신) 배열."""
+        p = 1.0 / (1.0 + np.exp(-1.702 * self.z(rows, score)))
+        return p, LABELS[(p >= LOW).astype(np.intp) + (p >= SAFE)]
+
+    def stats(self):
+        """그룹별 통계 표 (확인·분석용)."""
+        return pd.DataFrame({'count': self.count, 'mean': self.mean, 'slope': self.slope,
+                             'volatility': self.volatility, 'expected': self.expected})
+
+
+def load_chance_model(name, higher_is_better=False):
+    return load_derived(name, ('chance_model', higher_is_better),
+                        lambda df: ChanceModel(df, higher_is_better=higher_is_better))
@@ -0,0 +1,102 @@
+import math
+
+SUMMARY_PROMPT = """
+다음은 고등학생과 진로 상담 챗봇의 이전 대화입니다. 이후 상담을 이어가는 데 필요한 정보(학생의 관심사, 성향, 이미 추천한 직업과 학과, 학생의 반응과 질문)를 빠짐없이 10문장 이내로 요약해주세요.
+
+[기존 요약]
+{summary}
+
+[이어지는 대화]
+{dialogue}
+"""
+
+_ROLE_NAMES = {"user": "학생", "assistant": "상담사"}
+
+
+def estimate_tokens(text):
+    """토크나이저 없이 추정한 토큰 수 (영문·숫자는 약 4글자, 한글 등은 약 1.5글자에 1토큰) + 메시지 오버헤드."""
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 4
+
+
+class ChatContext:
+    """토큰 예산 안에서 API 로 보낼 대화 맥락을 만든다.
+
+    최근 keep_turns 턴(user+assistant)은 그대로 보내고, 예산을 넘을 때만 그 이전 메시지를 요약에 합친다.
+    이미 요약한 메시지는 다시 요약하지 않고, 기존 요약에 새로 밀려난 메시지만 더해 갱신한다.
+    summarize 는 프롬프트 문자열을 받아 요약문의 Future(concurrent.futures)를 반환하는 함수이다.
+    응답을 받은 뒤 prefetch() 를 부르면 다음 질문에 필요한 요약을 학생이 질문을 쓰는 동안 미리 만들어 둔다.
+    """
+
+    def __init__(self, summarize, token_budget=6000, keep_turns=4):
+        self.summarize = summarize
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.summary = ""
+        self.summarized = 0
+        self.tokens = []
+        self.pending = None
+
+    def _sync(self, messages):
+        del self.tokens[len(messages):]
+        for msg in messages[len(self.tokens):]:
+            self.tokens.append(estimate_tokens(msg["content"]))
+
+    def _summary_message(self):
+        return {"role": "system", "content": f"이전 대화 요약: {self.summary}"}
+
+    def context_tokens(self, system_prompt):
+        total = estimate_tokens(system_prompt) + sum(self.tokens[self.summarized:])
+        if self.summary:
+            total += estimate_tokens(self._summary_message()["content"])
+        return total
+
+    def _fold_until(self, system_prompt, messages):
+        """요약이 필요하면 요약에 합칠 메시지의 끝 위치, 아니면 None."""
+        fold_until = len(messages) - 2 * self.keep_turns
+        if self.context_tokens(system_prompt) > self.token_budget and fold_until > self.summarized:
+            return fold_until
+        return None
+
+    def _summarize(self, messages, fold_until):
+        dialogue = "\n".join(
+            f"{_ROLE_NAMES.get(m['role'], m['role'])}: {m['content']}" for m in messages[self.summarized:fold_until]
+        )
+        return self.summarize(SUMMARY_PROMPT.format(summary=self.summary or "(없음)", dialogue=dialogue))
+
+    def prefetch(self, system_prompt, messages):
+        """지금 맥락이 이미 예산을 넘었으면 다음 build 에서 쓸 요약을 미리 요청해 둔다."""
+        self._sync(messages)
+        fold_until = self._fold_until(system_prompt, messages)
+        if fold_until is not None and self.pending is None:
+            self.pending = (self.summarized, fold_until, self._summarize(messages, fold_until))
+
+    def build(self, system_prompt, messages):
+        """[system, (요약), 최근 메시지...] 형태로 API 에 보낼 메시지 목록."""
+        self._sync(messages)
+
+        if self.pending is not None:
+            start, fold_until, future = self.pending
+            self.pending = None
+            # 미리 요청한 요약이 지금 대화에 그대로 들어맞을 때만 쓴다. 실패했으면 아래에서 다시 요약한다.
+            if start == self.summarized and fold_until <= len(messages):
+                try:
+                    self.summary, self.summarized = future.result(), fold_until
+                except Exception:
+                    pass
+
+        fold_until = self._fold_until(system_prompt, messages)
+        if fold_until is not None:
+            self.summary = self._summarize(messages, fold_until).result()
+            self.summarized = fold_until
+
+        context = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            context.append(self._summary_message())
+        return context + [{"role": m["role"], "content": m["content"]} for m in messages[self.summarized:]]
+
+    def record_usage(self, messages, stats):
+        """방금 받은 assistant 응답의 토큰 수를 API 가 알려준 실제 값으로 바꾼다."""
+        self._sync(messages)
+        if messages and messages[-1]["role"] == "assistant" and "completion_tokens" in stats:
+            self.tokens[-1] = stats["completion_tokens"]
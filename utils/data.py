@@ -0,0 +1,178 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import shared, snapshot
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SNAPSHOT_DIR = os.path.join(DATA_DIR, "snapshot")
+
+DATASETS = ['Early_Results1', 'Early_Results2', 'Early_Results3', 'Regular_Results1']
+
+CATEGORY_COLUMNS = ['대학명', '학과명', '전형유형', '전형명']
+SCORE_COLUMNS = ['합격 등급', '합격 백분위']
+
+# 프로세스 전체(모든 세션)가 공유하는 데이터셋 캐시: name -> (mtime_ns, DataFrame)
+_cache = {}
+# 데이터셋에서 만든 색인 등의 캐시: (name, key) -> (DataFrame, value)
+_derived = {}
+_lock = threading.Lock()
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, f"{name}.csv")
+
+
+def snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f"{name}.arrow")
+
+
+def score_column(df):
+    return next(col for col in SCORE_COLUMNS if col in df.columns)
+
+
+def score_values(series):
+    # float32 로 저장된 점수를 원본 CSV 값(소수점 셋째 자리까지)으로 되돌린다
+    return series.astype('float64').round(3)
+
+
+def group_codes(df, columns):
+    """categorical 열 조합을 행마다 하나의 int64 키로 합친다. 결측값도 하나의 값으로 취급한다."""
+    key = np.zeros(len(df), dtype=np.int64)
+    for col in columns:
+        codes = df[col].cat.codes.to_numpy().astype(np.int64)
+        key = key * (len(df[col].cat.categories) + 1) + codes + 1
+    return key
+
+
+def read_results(path):
+    return prepare_results(pd.read_csv(path))
+
+
+def prepare_results(df, like=None):
+    """read_csv 로 읽은 결과 표를 검색용 형식(범주형 열, int16 년도, float32 점수)으로. 점수가 없는 행은 뺀다.
+
+    like(기존 데이터셋)를 주면 범주 목록을 like 의 범주 뒤에 새 값만 이어 붙여 만든다.
+    그래야 append_results 로 합쳐도 기존 행의 범주 코드와 그 위에 만든 색인이 그대로 유효하다.
+    """
+    score_col = score_column(df)
+    df[score_col] = pd.to_numeric(df[score_col], errors='coerce')
+    subset = [score_col]
+    if '년도' in df.columns:
+        df['년도'] = pd.to_numeric(df['년도'], errors='coerce')
+        subset.append('년도')
+    df = df.dropna(subset=subset).reset_index(drop=True)
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            values = df[col].str.strip()
+            if like is None:
+                df[col] = values.astype('category')
+            else:
+                known = like[col].cat.categories
+                added = pd.Index(values.dropna().unique()).difference(known).sort_values()
+                df[col] = pd.Categorical(values, categories=known.append(added))
+    if '년도' in df.columns:
+        df['년도'] = df['년도'].astype('int16')
+    df[score_col] = df[score_col].astype('float32')
+    return df
+
+
+def append_results(df, new):
+    """df 뒤에 new(prepare_results(..., like=df) 결과)를 이어 붙인다. 기존 행의 위치와 범주 코드는 바뀌지 않는다."""
+    df = df.copy()
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].cat.set_categories(new[col].cat.categories)
+    return pd.concat([df, new[df.columns]], ignore_index=True)
+
+
+def _read(name):
+    """(DataFrame, {load_derived 키: 값}). 발행된 공유 묶음(utils.shared)이 있으면 색인까지 그대로 쓴다."""
+    csv_path = data_path(name)
+    source_hash = snapshot.file_hash(csv_path)
+    bundle = shared.read_bundle(shared.bundle_path(name), source_hash)
+    if bundle is not None:
+        return bundle
+    df = snapshot.read_snapshot(snapshot_path(name), source_hash)
+    if df is None:
+        df = read_results(csv_path)
+    return df, {}
+
+
+def load_results(name):
+    """data/{name}.csv 를 프로세스당 한 번만 읽고, 파일이 바뀐 경우에만 다시 읽는다.
+
+    CSV 와 내용이 같은 공유 묶음(utils.shared)이 있으면 그것을 mmap 으로 붙여 색인까지 함께 쓰고,
+    없으면 스냅샷(data/snapshot/{name}.arrow), 그것도 없으면 CSV 를 읽는다.
+
+    반환되는 DataFrame 은 모든 세션이 공유하므로 페이지에서 직접 수정하지 말고 복사본을 사용할 것.
+    """
+    path = data_path(name)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _cache.get(name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _lock:
+        cached = _cache.get(name)
+        if cached is None or cached[0] != mtime:
+            df, derived = _read(name)
+            cached = (mtime, df)
+            _cache[name] = cached
+            for key, value in derived.items():
+                _derived[(name, key)] = (df, value)
+    return cached[1]
+
+
+def dataset_version(name):
+    """load_results(name) 이 지금 돌려주는 데이터의 버전(파일 mtime). 파일이 바뀌어 다시 읽히면 달라진다."""
+    load_results(name)
+    return _cache[name][0]
+
+
+def load_derived(name, key, build):
+    """load_results(name) 으로 만든 build(df) 결과를 캐시한다. 데이터셋이 다시 읽히면 새로 만든다."""
+    df = load_results(name)
+    cached = _derived.get((name, key))
+    if cached is not None and cached[0] is df:
+        return cached[1]
+
+    with _lock:
+        cached = _derived.get((name, key))
+        if cached is None or cached[0] is not df:
+            cached = (df, build(df))
+            _derived[(name, key)] = cached
+    return cached[1]
+
+
+def replace_results(name, df, derived=None):
+    """name 의 캐시를 df 와 색인 {load_derived 키: 값} 으로 바꾼다. utils.ingest 가 파일을 바꾼 뒤 색인을 이어 쓸 때 쓴다."""
+    with _lock:
+        _cache[name] = (os.stat(data_path(name)).st_mtime_ns, df)
+        for key in [key for key in _derived if key[0] == name]:
+            del _derived[key]
+        for key, value in (derived or {}).items():
+            _derived[(name, key)] = (df, value)
+
+
+def derived_for(name):
+    """지금 캐시된 name 의 load_derived 결과 {키: 값} (공유 묶음 발행용)."""
+    df = load_results(name)
+    return {key: value for (dataset, key), (source, value) in list(_derived.items()) if dataset == name and source is df}
+
+
+def build_snapshots(names=DATASETS):
+    for name in names:
+        csv_path = data_path(name)
+        df = read_results(csv_path)
+        snapshot.write_snapshot(snapshot_path(name), df, snapshot.file_hash(csv_path))
+        print(f"{name}: {len(df)} rows -> {snapshot_path(name)}")
+
+
+if __name__ == '__main__':
+    build_snapshots(sys.argv[1:] or DATASETS)
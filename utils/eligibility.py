@@ -0,0 +1,63 @@
+import re
+
+import numpy as np
+
+from utils.data import load_derived
+
+COLUMN = '지원자격'
+
+# 비트 순서가 바뀌지 않도록 알려진 자격을 먼저 두고, 데이터에서 새로 나온 자격은 뒤에 이름순으로 붙인다
+KNOWN = ('기초생활', '차상위', '한부모', '특성화고', '농어촌')
+ALIASES = {'기초생활수급자': '기초생활', '기초수급자': '기초생활', '차상위계층': '차상위', '한부모가족': '한부모'}
+
+_SEPARATORS = re.compile(r"[,/·]")
+
+
+def parse_eligibility(text):
+    """'농어촌, 기초생활수급자' 같은 문자열을 표준 자격 이름 목록으로. 빈 값이면 빈 리스트."""
+    if not isinstance(text, str):
+        return []
+    names = (" ".join(part.split()) for part in _SEPARATORS.split(text))
+    return list(dict.fromkeys(ALIASES.get(name, name) for name in names if name))
+
+
+def normalize_options(options):
+    """자격 이름 목록(또는 '농어촌, 기초생활' 같은 문자열)을 표준 이름의 정렬된 튜플로."""
+    if isinstance(options, str):
+        options = parse_eligibility(options)
+    return tuple(sorted({ALIASES.get(name, name) for name in options}))
+
+
+class EligibilityIndex:
+    """지원자격 열을 행마다 자격별 비트를 켠 정수(bitmask)로 바꿔 둔 색인.
+
+    서로 다른 지원자격 문자열(수십 개)만 한 번 파싱하고 행에는 코드로 펼친다.
+    여러 자격을 가진 학생의 검색은 비트 OR 한 값과의 AND 한 번으로 끝난다.
+    """
+
+    def __init__(self, series):
+        codes, texts = series.factorize()
+        parsed = [parse_eligibility(text) for text in texts]
+
+        found = {name for names in parsed for name in names}
+        self.names = list(KNOWN) + sorted(found - set(KNOWN))
+        self.bit = {name: 1 << i for i, name in enumerate(self.names)}
+
+        text_bits = np.array([sum(self.bit[name] for name in names) for names in parsed] + [0], dtype=np.int64)
+        # factorize 는 결측값을 -1 로 주므로 마지막 0 이 결측값의 비트가 된다
+        self.bits = text_bits[codes]
+
+    def query_bits(self, options):
+        """자격 이름(들)의 비트 OR. 데이터에 없는 자격은 0 이다."""
+        bits = 0
+        for name in normalize_options(options):
+            bits |= self.bit.get(name, 0)
+        return bits
+
+    def mask(self, options):
+        """options 중 하나라도 지원할 수 있는 행이면 True 인 bool 배열."""
+        return (self.bits & self.query_bits(options)) != 0
+
+
+def load_eligibility(name, column=COLUMN):
+    return load_derived(name, ('eligibility', column), lambda df: EligibilityIndex(df[column]))
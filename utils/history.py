@@ -0,0 +1,74 @@
+import numpy as np
+
+from utils.data import group_codes, load_derived
+
+
+class HistoryIndex:
+    """(대학명, 학과명) 별 연도 이력 색인.
+
+    행을 (키, 연도 내림차순, 원래 순서)로 정렬해 두고, 결과 여러 건의 이력을 searchsorted 로 한 번에 찾는다.
+    """
+
+    def __init__(self, df, keys=('대학명', '학과명'), year_col='년도'):
+        self.df = df
+        self.keys = keys
+        self.year_col = year_col
+        key = group_codes(df, keys)
+        years = df[year_col].to_numpy().astype(np.int64)
+
+        self.order = np.lexsort((np.arange(len(df)), -years, key))
+        self.sorted_keys = key[self.order]
+        self.sorted_years = years[self.order]
+
+    def extend(self, df, start):
+        """df 가 색인한 데이터 뒤에 행을 이어 붙인 것(utils.data.append_results)일 때 새 행(start 부터)을 반영한 색인.
+
+        범주는 뒤에만 늘어나므로 기존 (키, 연도) 순서는 그대로이고, 새 행만 정렬해 해당 (대학명, 학과명) 자리에 끼워 넣는다.
+        """
+        for col in self.keys:
+            old = self.df[col].cat.categories
+            if not df[col].cat.categories[:len(old)].equals(old):
+                return HistoryIndex(df, self.keys, self.year_col)
+
+        key = group_codes(df, self.keys)
+        rows = np.arange(start, len(df))
+        years = df[self.year_col].to_numpy()[start:].astype(np.int64)
+        new = np.lexsort((rows, -years, key[start:]))
+        rows, years = rows[new], years[new]
+
+        # (키, 연도 내림차순) 을 정수 하나로 합쳐 searchsorted. 같은 자리면 위치가 큰 새 행이 뒤에 온다
+        def pair(keys, years):
+            return keys * 2 ** 16 + (2 ** 15 - 1 - years)
+
+        at = np.searchsorted(pair(key[self.order], self.sorted_years), pair(key[rows], years), side='right')
+        index = HistoryIndex.__new__(HistoryIndex)
+        index.df, index.keys, index.year_col = df, self.keys, self.year_col
+        index.order = np.insert(self.order, at, rows)
+        index.sorted_keys = key[index.order]
+        index.sorted_years = np.insert(self.sorted_years, at, years)
+        return index
+
+    def lookup(self, rows, start_year, end_year):
+        """rows(같은 데이터셋의 결과 행들) 각각의 start_year~end_year 이력.
+
+        (history, offsets) 를 반환한다. i 번째 결과의 이력은 history.iloc[offsets[i]:offsets[i + 1]] 이며
+        연도 내림차순이다.
+        """
+        wanted = group_codes(rows, self.keys)
+        lo = np.searchsorted(self.sorted_keys, wanted, side='left')
+        hi = np.searchsorted(self.sorted_keys, wanted, side='right')
+
+        counts = hi - lo
+        owner = np.repeat(np.arange(len(wanted)), counts)
+        idx = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        years = self.sorted_years[idx]
+        keep = (years >= start_year) & (years <= end_year)
+        idx, owner = idx[keep], owner[keep]
+
+        offsets = np.searchsorted(owner, np.arange(len(wanted) + 1), side='left')
+        return self.df.iloc[self.order[idx]], offsets
+
+
+def load_history_index(name):
+    return load_derived(name, 'history_index', HistoryIndex)
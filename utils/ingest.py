@@ -0,0 +1,204 @@
+"""새 입시 연도 결과를 데이터셋에 추가한다.
+
+    python -m utils.ingest Early_Results1 2026_교과.csv [--dry-run] [--publish]
+
+새 CSV 는 데이터셋과 같은 열(대학명, 학과명, 전형명, 년도, 점수 열)이어야 한다 (UTF-8 또는 CP949).
+검사를 통과하면 기존 행과 똑같은 행은 빼고, 점수가 없거나 입력 가능한 점수 범위(admissions.TRACKS 의 score_range)를
+벗어난 행(0, 616 같은 자리 표시 값)도 검색에 쓰이지 않으므로 뺀 뒤 나머지를 이어 붙인다. 뺀 행 수는 결과에 함께 알린다.
+이미 있는 (대학명, 학과명, 전형명, 년도) 와 점수가 다른 행이 있으면 아무것도 바꾸지 않고 오류로 알린다.
+
+CSV 를 처음부터 다시 읽지 않는다. 이미 읽어 둔 데이터셋(공유 묶음이나 스냅샷) 뒤에 새 행을 붙여 스냅샷을 쓰고,
+공유 묶음(utils.shared)이 있으면 그 색인도 새 행이 들어간 연도 구획과 (대학명, 학과명) 자리에만 끼워 넣어 다시 발행한다.
+검색 대상 연도는 데이터의 가장 최근 년도(admissions.year_range)라서 페이지를 고칠 필요가 없고,
+실행 중인 페이지는 CSV 가 바뀐 것을 보고 새 스냅샷·묶음을 읽는다.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+from utils import admissions, data, shared, snapshot
+
+# 중복 검사에 쓰는 (대학명, 학과명, 전형명, 년도) 키를 이어 붙일 구분자
+_SEP = "\x1f"
+# 오류마다 보여줄 최대 행 수
+MAX_REPORTED = 5
+
+
+def read_csv(source):
+    for encoding in ('utf-8-sig', 'cp949'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        try:
+            return pd.read_csv(source, dtype=str, encoding=encoding, keep_default_na=False)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("CSV 파일의 인코딩을 읽을 수 없습니다. UTF-8 또는 CP949 로 저장해주세요.")
+
+
+def dataset_columns(name):
+    with open(data.data_path(name), encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f))
+
+
+def _score_range(name):
+    return next(config["score_range"] for config in admissions.TRACKS.values() if config["dataset"] == name)
+
+
+def _rows(mask):
+    # mask(bool Series)가 True 인 행의 CSV 줄 번호 (머리글이 1행)
+    return ", ".join(str(i + 2) for i in mask.index[mask.to_numpy()][:MAX_REPORTED])
+
+
+def validate(name, raw):
+    """새 행을 검사해 데이터셋 열 순서로 바꾼 문자열 표를 돌려준다. 잘못된 행이 있으면 ValueError."""
+    columns = dataset_columns(name)
+    if '년도' not in columns:
+        raise ValueError(f"{name} 에는 년도 열이 없어 연도별로 추가할 수 없습니다.")
+    raw = raw.rename(columns=lambda c: str(c).strip())
+    missing = [c for c in columns if c not in raw.columns]
+    if missing:
+        raise ValueError(f"열이 없습니다: {', '.join(missing)}")
+    raw = raw[columns].apply(lambda column: column.str.strip())
+
+    years = pd.to_numeric(raw['년도'], errors='coerce')
+    problems = [
+        (raw[[c for c in data.CATEGORY_COLUMNS if c in columns]].eq('').any(axis=1), "대학명·학과명·전형명이 비어 있습니다"),
+        (years.isna() | (years % 1 != 0) | ~years.between(2000, 2100), "년도가 올바르지 않습니다"),
+    ]
+    errors = [f"{message} ({_rows(mask)}행)" for mask, message in problems if mask.any()]
+    if errors:
+        raise ValueError("\n".join(errors))
+    return raw
+
+
+def _keys(df, score_col):
+    """((대학명, 학과명, 전형명, 년도) 키, 키 + 점수) 문자열 Series."""
+    key = df['년도'].astype(int).astype(str)
+    for column in reversed([c for c in data.CATEGORY_COLUMNS if c in df.columns]):
+        key = df[column].astype(str) + _SEP + key
+    score = data.score_values(pd.to_numeric(df[score_col]).astype('float32')).map("{:.3f}".format).astype(str)
+    return key, key + _SEP + score
+
+
+def new_rows(raw, df, score_range):
+    """validate 를 통과한 raw 에서 실제로 추가할 행과 제외한 행 수 {duplicates, no_score, out_of_range}.
+
+    기존 데이터는 새 행과 같은 연도 구획만 비교한다.
+    """
+    score_col = data.score_column(raw)
+    # 빈 칸이나 '등록자없음' 같은 글자는 read_results 와 마찬가지로 점수 없음으로 본다
+    scores = pd.to_numeric(raw[score_col], errors='coerce')
+    has_score = scores.notna()
+    in_range = scores.between(*score_range)
+    raw = raw[in_range]
+    key, full = _keys(raw, score_col)
+
+    # 한 해 안에 같은 키가 점수만 달리 여러 번 나오는 것은 기존 데이터에도 있으므로 새 파일 안에서는 허용한다
+    old = df[df['년도'].isin(raw['년도'].astype(int).unique())]
+    old_key, old_full = _keys(old, score_col)
+    duplicate = full.isin(old_full) | full.duplicated()
+    conflict = key.isin(old_key) & ~full.isin(old_full)
+    if conflict.any():
+        raise ValueError(f"이미 있는 (대학명, 학과명, 전형명, 년도) 와 점수가 다른 행이 있습니다 ({_rows(conflict)}행)")
+
+    skipped = {"duplicates": int(duplicate.sum()), "no_score": int((~has_score).sum()),
+               "out_of_range": int((has_score & ~in_range).sum())}
+    return raw[~duplicate].reset_index(drop=True), skipped
+
+
+def extend_indexes(derived, df, start):
+    """공유 묶음에서 읽은 색인 중 이어 붙일 수 있는 것(score/history index, matcher)만 새 행을 반영해 돌려준다.
+
+    나머지(합격 가능성 모델, 최근 연도 등)는 버리며 처음 쓰일 때(또는 발행할 때) 새 데이터로 다시 만든다.
+    """
+    extended = {}
+    for key, value in derived.items():
+        if key in ('score_index', 'history_index'):
+            extended[key] = value.extend(df, start)
+        elif isinstance(key, tuple) and key[0] == 'matcher':
+            extended[key] = value.extend(df[key[1]].cat.categories)
+    return extended
+
+
+def _append_csv(path, rows):
+    """path 에 rows 를 이어 붙인 파일을 path.tmp 로 만든다. 원본의 줄바꿈(CRLF/LF)을 따른다."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    newline = '\r\n' if b'\r\n' in content[:4096] else '\n'
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=newline).writerows(rows.itertuples(index=False))
+    if content and not content.endswith(b'\n'):
+        content += newline.encode()
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content + buffer.getvalue().encode('utf-8'))
+    return tmp_path
+
+
+def ingest(name, source, dry_run=False, publish=None):
+    """source(CSV 경로 또는 파일 객체)의 새 행을 name 데이터셋에 추가하고 처리 결과 dict 를 돌려준다.
+
+    publish 가 None 이면 공유 묶음이 이미 있을 때만 다시 발행한다.
+    """
+    start_time = time.perf_counter()
+    raw = validate(name, read_csv(source))
+    df = data.load_results(name)
+    rows, stats = new_rows(raw, df, _score_range(name))
+    stats.update(dataset=name, received=len(raw), added=len(rows),
+                 years=sorted(int(y) for y in rows['년도'].astype(int).unique()))
+    if dry_run or rows.empty:
+        stats["elapsed"] = time.perf_counter() - start_time
+        return stats
+
+    new = data.prepare_results(rows.copy(), like=df)
+    combined = data.append_results(df, new)
+    bundle = shared.bundle_path(name)
+    if publish is None:
+        publish = os.path.exists(bundle)
+    indexes = extend_indexes(data.derived_for(name), combined, len(df))
+
+    # 스냅샷을 먼저 쓰고 CSV 를 바꾼다. 그 사이에 읽는 프로세스는 해시가 맞지 않아 이전 방식(CSV)으로 읽을 뿐이다
+    csv_path = data.data_path(name)
+    tmp_path = _append_csv(csv_path, rows)
+    source_hash = snapshot.file_hash(tmp_path)
+    snapshot.write_snapshot(data.snapshot_path(name), combined, source_hash)
+    os.replace(tmp_path, csv_path)
+    data.replace_results(name, combined, indexes)
+
+    if publish:
+        admissions.warm_up([track for track, config in admissions.TRACKS.items() if config["dataset"] == name])
+        shared.write_bundle(bundle, combined, data.derived_for(name), source_hash)
+    stats.update(rows=len(combined), extended=len(indexes), published=publish, elapsed=time.perf_counter() - start_time)
+    return stats
+
+
+def format_stats(stats):
+    years = ", ".join(map(str, stats["years"])) or "-"
+    text = (f"{stats['dataset']}: {stats['received']}행 중 {stats['added']}행 추가 ({years}년) · "
+            f"중복 {stats['duplicates']}행, 점수 없음 {stats['no_score']}행, 점수 범위 밖 {stats['out_of_range']}행 제외")
+    if "rows" in stats:
+        text += f" · 전체 {stats['rows']}행, 색인 {stats['extended']}개 이어 붙임"
+        if stats["published"]:
+            text += ", 공유 묶음 발행"
+    return text + f" · {stats['elapsed']:.2f}초"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="새 입시 연도 결과 CSV 를 데이터셋에 추가한다.")
+    parser.add_argument("dataset", choices=[n for n in data.DATASETS if '년도' in dataset_columns(n)])
+    parser.add_argument("input")
+    parser.add_argument("--dry-run", action="store_true", help="검사와 중복 확인만 하고 파일은 바꾸지 않는다")
+    parser.add_argument("--publish", action="store_true", default=None,
+                        help="공유 묶음이 없어도 새로 발행한다 (기본: 있을 때만 다시 발행)")
+    args = parser.parse_args()
+    try:
+        result = ingest(args.dataset, args.input, args.dry_run, args.publish)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(format_stats(result), file=sys.stderr)
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+import openai
+from openai import AsyncOpenAI
+
+MODEL = "gpt-4o-mini"
+
+# 동시에 OpenAI 로 나가는 요청 수 상한 (프로세스 전체)
+MAX_CONCURRENCY = int(os.environ.get("HIGHAI_LLM_CONCURRENCY", "8"))
+TIMEOUT = float(os.environ.get("HIGHAI_LLM_TIMEOUT", "60"))
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+_RETRYABLE = (openai.RateLimitError, openai.InternalServerError, openai.APITimeoutError, openai.APIConnectionError)
+
+# OpenAI 호출은 모두 프로세스에 하나뿐인 백그라운드 이벤트 루프에서 실행한다.
+# 세션(스크립트 스레드)은 submit() 으로 요청을 넘기고 Future 를 기다리므로, 응답을 기다리는 동안 스레드를 따로 붙잡지 않고
+# 서로 독립인 호출 여러 개를 한 번에 보낼 수 있다. _clients 와 _slots 는 루프 스레드에서만 쓴다.
+_loop = None
+_loop_lock = threading.Lock()
+_clients = {}
+_slots = asyncio.Semaphore(MAX_CONCURRENCY)
+
+
+class _Metrics:
+
+    def __init__(self, size=1000):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=size)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            stats = {"calls": self.calls, "errors": self.errors, "retries": self.retries, "in_flight": self.in_flight}
+        for name, q in (("p50_ms", 0.5), ("p95_ms", 0.95)):
+            stats[name] = round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1) if latencies else None
+        return stats
+
+
+metrics = _Metrics()
+
+
+def _get_loop():
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """coroutine 을 공유 이벤트 루프에서 실행한다. concurrent.futures.Future 를 반환한다."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def get_client(api_key):
+    """api_key 별로 하나의 AsyncOpenAI 클라이언트(keep-alive 연결 풀)를 공유한다. 루프 스레드에서만 부른다.
+
+    base_url 은 OpenAI SDK 와 같이 OPENAI_BASE_URL 환경 변수로 바꿀 수 있다 (로컬 stub 서버 테스트용).
+    재시도는 SDK 대신 _with_retries 에서 처리한다.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = _clients[api_key] = AsyncOpenAI(api_key=api_key, max_retries=0, timeout=TIMEOUT)
+    return client
+
+
+def _backoff(attempt, error):
+    retry_after = None
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    delay = retry_after if retry_after is not None else BACKOFF_BASE * 2 ** attempt
+    return min(BACKOFF_MAX, delay) * random.uniform(0.8, 1.2)
+
+
+async def _with_retries(create):
+    """429, 5xx, 타임아웃, 연결 오류는 지수 백오프로 MAX_RETRIES 번까지 다시 시도한다."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return await create()
+        except _RETRYABLE as e:
+            if attempt == MAX_RETRIES:
+                raise
+            with metrics.lock:
+                metrics.retries += 1
+            await asyncio.sleep(_backoff(attempt, e))
+
+
+def _begin():
+    with metrics.lock:
+        metrics.calls += 1
+        metrics.in_flight += 1
+    return time.perf_counter()
+
+
+def _end(start, failed):
+    with metrics.lock:
+        metrics.in_flight -= 1
+        if failed:
+            metrics.errors += 1
+        else:
+            metrics.latencies.append(time.perf_counter() - start)
+
+
+async def ask_gpt_async(prompt, api_key, timeout=TIMEOUT):
+    client = get_client(api_key)
+    async with _slots:
+        start = _begin()
+        failed = True
+        try:
+            response = await _with_retries(lambda: client.chat.completions.create(
+                model=MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=timeout
+            ))
+            failed = False
+        finally:
+            _end(start, failed)
+    return response.choices[0].message.content
+
+
+def submit_gpt(prompt, api_key, timeout=TIMEOUT):
+    """ask_gpt 를 기다리지 않고 보낸다. 여러 요청을 먼저 보내 두고 Future.result() 로 받으면 동시에 처리된다."""
+    return submit(ask_gpt_async(prompt, api_key, timeout))
+
+
+def ask_gpt(prompt, api_key, timeout=TIMEOUT):
+    return submit_gpt(prompt, api_key, timeout).result()
+
+
+async def _stream_chat_async(messages, api_key, stats, model, timeout, start, emit):
+    client = get_client(api_key)
+    async with _slots:
+        call_start = _begin()
+        stream = None
+        failed = True
+        try:
+            stream = await _with_retries(lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=timeout
+            ))
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    stats["prompt_tokens"] = chunk.usage.prompt_tokens
+                    stats["completion_tokens"] = chunk.usage.completion_tokens
+                    stats["total_tokens"] = chunk.usage.total_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    stats.setdefault("ttft", time.perf_counter() - start)
+                    emit(chunk.choices[0].delta.content)
+            failed = False
+        except asyncio.CancelledError:
+            failed = False
+            raise
+        finally:
+            if stream is not None:
+                await stream.close()
+            _end(call_start, failed)
+
+
+_DONE = object()
+
+
+def stream_chat(messages, api_key, stats, model=MODEL, timeout=TIMEOUT):
+    """응답을 토큰이 도착하는 대로 yield 한다.
+
+    stats 에 첫 토큰까지 걸린 시간(ttft), 전체 시간(total_time)과 토큰 사용량을 채운다.
+    요청은 공유 이벤트 루프에서 실행되고 토큰은 큐로 넘겨받는다.
+    호출한 쪽에서 중간에 멈추면(generator close) 요청을 취소해 연결도 바로 닫는다.
+    재시도는 첫 응답을 받기 전(연결·요청 단계)에만 한다.
+    """
+    start = time.perf_counter()
+    tokens = queue.SimpleQueue()
+    future = submit(_stream_chat_async(messages, api_key, stats, model, timeout, start, tokens.put))
+    future.add_done_callback(lambda _: tokens.put(_DONE))
+    try:
+        while (token := tokens.get()) is not _DONE:
+            yield token
+        future.result()
+    finally:
+        future.cancel()
+        stats["total_time"] = time.perf_counter() - start
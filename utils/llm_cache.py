@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+
+
+def normalize_text(text):
+    """캐시 키용 정규화: 유니코드 NFC, 공백 하나로, 소문자."""
+    return unicodedata.normalize("NFC", " ".join(str(text).split())).lower()
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LLMCache:
+    """LLM 응답을 로컬 SQLite 파일에 저장하는 캐시.
+
+    - ttl 초가 지난 항목은 만료되고, max_entries 를 넘으면 가장 오래 조회되지 않은 항목부터 지운다(LRU).
+    - 같은 키에 대한 동시 요청은 하나의 호출 결과를 함께 기다린다.
+    - 값은 JSON 으로 저장하며, 빈 값(None, 빈 리스트 등)은 저장하지 않는다.
+    - get/set 을 직접 쓰는 쪽은 record() 로 hits/misses 등을 직접 센다.
+    """
+
+    def __init__(self, path, ttl=30 * 24 * 3600, max_entries=5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "evictions": 0, "refreshes": 0}
+
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._in_flight = {}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._db_lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+    def get(self, key):
+        now = time.time()
+        with self._db_lock, self._db:
+            row = self._db.execute(
+                "SELECT value FROM cache WHERE key = ? AND created >= ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._db.execute("DELETE FROM cache WHERE created < ?", (now - self.ttl,))
+            overflow = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)", (overflow,)
+                )
+                self.record("evictions", overflow)
+
+    def record(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            self.record("hits")
+            return value
+
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = self._in_flight[key] = _InFlight()
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.value
+
+        try:
+            in_flight.value = compute()
+            if in_flight.value:
+                self.set(key, in_flight.value)
+        except Exception as e:
+            in_flight.error = e
+            self.record("errors")
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.done.set()
+        return in_flight.value
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return (self.stats["hits"] + self.stats["coalesced"]) / total if total else 0.0
@@ -0,0 +1,388 @@
+import json
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+from utils.data import DATA_DIR, DATASETS, load_results
+
+INDEX_PATH = os.path.join(DATA_DIR, "major_index.json")
+INDEX_VERSION = 1
+
+TOP_K = 15
+MIN_SIMILARITY = 0.35
+# 이 비율보다 많은 학과에 나오는 bigram(예: '공학', '학과')은 유사도 계산에서 제외한다
+MAX_DF_RATIO = 0.05
+
+SEED_LIMIT = 3
+TERM_LIMIT = 2
+
+# 오타 교정: 자모 bigram 이 많이 겹치는 후보 FUZZY_CANDIDATES 개만 편집 거리로 다시 매기고, 유사도가 FUZZY_MIN 이상이면 교정한다
+FUZZY_CANDIDATES = 25
+FUZZY_MIN = 0.8
+# 입력이 학과명의 일부와 비슷한 경우(예: '컴퓨타' -> '컴퓨터공학')는 전체가 비슷한 경우보다 조금 낮게 친다
+PARTIAL_WEIGHT = 0.9
+
+# 키워드 -> 학문적으로 연관된 학과 키워드 (GPT 프롬프트의 '선호 교과목 연계' 기준을 옮긴 것)
+SYNONYMS = {
+    "컴퓨터": ["소프트웨어", "인공지능", "정보통신", "데이터", "전산", "정보보호", "정보보안"],
+    "소프트웨어": ["컴퓨터", "인공지능", "정보통신", "데이터"],
+    "인공지능": ["컴퓨터", "소프트웨어", "데이터"],
+    "전자": ["전기", "반도체", "정보통신", "제어"],
+    "전기": ["전자", "반도체", "에너지"],
+    "기계": ["자동차", "항공우주", "로봇", "메카트로닉스"],
+    "물리": ["기계공학", "전기", "전자", "반도체", "천문", "에너지"],
+    "화학": ["신소재", "약학", "화공", "고분자", "재료", "에너지"],
+    "생명과학": ["생물", "의예", "농학", "바이오", "분자유전"],
+    "생물": ["생명과학", "의예", "농학", "바이오"],
+    "수학": ["통계", "데이터", "수리", "금융"],
+    "통계": ["수학", "데이터", "정보통계"],
+    "역사": ["사학", "고고", "한국사", "문화재"],
+    "사학": ["역사", "고고", "문화재"],
+    "경영": ["회계", "경제", "무역", "금융", "마케팅"],
+    "경제": ["경영", "금융", "무역", "통계"],
+    "심리": ["상담", "아동", "사회복지"],
+    "간호": ["보건", "임상병리", "응급구조"],
+    "의예": ["의학", "치의예", "한의예", "약학"],
+    "약학": ["제약", "화학", "생명과학"],
+    "국어": ["국어국문", "한국어", "문예창작"],
+    "국문": ["국어국문", "한국어문", "문예창작"],
+    "영어": ["영어영문", "영미", "영문", "통번역"],
+    "환경": ["에너지", "지구", "대기", "생태"],
+    "지구과학": ["지구", "지질", "대기", "해양", "천문"],
+    "건축": ["건설", "토목", "도시", "실내"],
+    "법학": ["경찰", "행정", "공공"],
+    "행정": ["정치", "법학", "공공"],
+    "미디어": ["언론", "방송", "영상", "커뮤니케이션", "광고"],
+    "디자인": ["시각", "산업디자인", "영상", "미디어"],
+}
+
+# 흔히 쓰는 줄임말 -> 학과 핵심어. 입력 전체가 줄임말과 같을 때만 바꾼다 (실제 학과명의 일부인 '기공', '수교' 등은 넣지 않는다)
+ABBREVIATIONS = {
+    "컴공": "컴퓨터공학",
+    "전전": "전기전자",
+    "전컴": "전자컴퓨터",
+    "전정": "전자정보",
+    "정통": "정보통신",
+    "소융": "소프트웨어융합",
+    "데사": "데이터사이언스",
+    "산공": "산업공학",
+    "화공": "화학공학",
+    "생공": "생명공학",
+    "건공": "건축공학",
+    "환공": "환경공학",
+    "도공": "도시공학",
+    "금공": "금융공학",
+    "항우": "항공우주",
+    "사복": "사회복지",
+    "유교": "유아교육",
+    "초교": "초등교육",
+    "체교": "체육교육",
+    "영교": "영어교육",
+    "국교": "국어교육",
+    "신방": "신문방송",
+    "언홍": "언론홍보",
+    "미컴": "미디어커뮤니케이션",
+    "문창": "문예창작",
+    "실디": "실내디자인",
+    "시디": "시각디자인",
+    "산디": "산업디자인",
+    "물치": "물리치료",
+    "작치": "작업치료",
+    "임병": "임상병리",
+    "식영": "식품영양",
+    "호경": "호텔경영",
+    "경행": "경찰행정",
+    "의대": "의예",
+    "치대": "치의예",
+    "한의대": "한의예",
+    "수의대": "수의예",
+    "약대": "약학",
+    "법대": "법학",
+    "간호대": "간호",
+}
+
+# 키워드가 포함되어 있어도 학문적 연관성이 없는 학과 (예: 물리 → 물리치료학과, 화학 → 문화학과)
+EXCLUDE = {
+    "물리": ["치료"],
+    "의예": ["창의예"],
+    "화학": ["문화학", "영화학"],
+    "사학": ["간호사학", "교사학", "군사학"],
+    "수학": ["수학여행"],
+}
+
+_SUFFIXES = ("전공", "계열", "과", "부")
+_BRACKETS = re.compile(r"[(\[{（【].*?[)\]}）】]")
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+
+_index = None
+_index_mtime = None
+_lock = threading.Lock()
+
+
+def major_stem(name):
+    """학과명에서 괄호와 '과/부/전공/계열' 같은 단위 접미사를 떼어 낸 핵심어. 예: '컴퓨터공학부(야간)' -> '컴퓨터공학'"""
+    text = _BRACKETS.sub(" ", name.lower()).split()
+    if not text:
+        return ""
+    stem = _NON_WORD.sub("", text[0])
+    changed = True
+    while changed:
+        changed = False
+        for suffix in _SUFFIXES:
+            if stem.endswith(suffix) and len(stem) - len(suffix) >= 2:
+                stem = stem[:-len(suffix)]
+                changed = True
+    return stem
+
+
+def bigrams(stem):
+    if len(stem) < 2:
+        return {stem}
+    return {stem[i:i + 2] for i in range(len(stem) - 1)}
+
+
+def jamo(text):
+    """한글 음절을 초성·중성·종성 자모로 푼다 (NFD). 한 글자 오타가 편집 거리 1~2 로 잡힌다. 예: '겅영' 과 '경영'"""
+    return unicodedata.normalize("NFD", text)
+
+
+def jamo_bigrams(text):
+    padded = f"^{text}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def edit_distances(a, b):
+    """(a 와 b 의 편집 거리, a 와 b 의 한 부분 사이의 최소 편집 거리). 뒤의 값은 b 앞뒤를 건너뛰는 비용이 0 이다."""
+    whole = list(range(len(b) + 1))
+    part = [0] * (len(b) + 1)
+    for i, ca in enumerate(a, 1):
+        w, p = [i], [i]
+        for j, cb in enumerate(b, 1):
+            diff = ca != cb
+            w.append(min(whole[j] + 1, w[j - 1] + 1, whole[j - 1] + diff))
+            p.append(min(part[j] + 1, p[j - 1] + 1, part[j - 1] + diff))
+        whole, part = w, p
+    return whole[-1], min(part)
+
+
+def _similarity_graph(stems):
+    # bigram 을 정렬해 두어 실수 합의 순서(따라서 동점 처리)가 PYTHONHASHSEED 에 따라 바뀌지 않게 한다
+    grams = [sorted(bigrams(s)) for s in stems]
+    doc_freq = Counter(g for gs in grams for g in gs)
+    idf = {g: math.log(len(stems) / n) for g, n in doc_freq.items()}
+    norms = [math.sqrt(sum(idf[g] ** 2 for g in gs)) or 1.0 for gs in grams]
+
+    max_df = max(2, int(len(stems) * MAX_DF_RATIO))
+    postings = defaultdict(list)
+    for i, gs in enumerate(grams):
+        for g in gs:
+            if doc_freq[g] <= max_df:
+                postings[g].append(i)
+
+    related = []
+    for i, gs in enumerate(grams):
+        dots = defaultdict(float)
+        for g in gs:
+            weight = idf[g] ** 2
+            for j in postings.get(g, ()):
+                if j != i:
+                    dots[j] += weight
+        # 유사도가 같으면 학과명 순 (stems 가 정렬되어 있어 j 순서와 같다)
+        scored = sorted((-round(dot / (norms[i] * norms[j]), 3), j) for j, dot in dots.items())
+        related.append([[j, -score] for score, j in scored[:TOP_K] if -score >= MIN_SIMILARITY])
+    return related
+
+
+def _enrich_with_llm(stems, keywords, api_key):
+    from utils.majors import expand_majors
+
+    known = set(stems)
+    enriched = {}
+    expanded = expand_majors(keywords, api_key)
+    for keyword in keywords:
+        terms = []
+        for name in expanded[keyword]:
+            stem = major_stem(name)
+            if stem in known and keyword not in stem and stem not in terms:
+                terms.append(stem)
+        enriched[keyword] = terms
+        print(f"{keyword}: {', '.join(terms)}")
+    return enriched
+
+
+def build_index(path=INDEX_PATH, enrich_keywords=None, api_key=None):
+    """모든 데이터셋의 학과명으로 연관 학과 그래프를 만들어 path 에 저장한다."""
+    counts = Counter()
+    for name in DATASETS:
+        for major, n in load_results(name)['학과명'].value_counts().items():
+            stem = major_stem(major)
+            if stem:
+                counts[stem] += int(n)
+    stems = sorted(counts)
+
+    index = {
+        "version": INDEX_VERSION,
+        "stems": stems,
+        "counts": [counts[s] for s in stems],
+        "related": _similarity_graph(stems),
+        "llm_synonyms": _enrich_with_llm(stems, enrich_keywords, api_key) if enrich_keywords else {},
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    print(f"{len(stems)} majors -> {path}")
+
+
+class MajorIndex:
+    """build_index 로 만든 학과 핵심어 색인. 입력 전공의 줄임말·오타를 바로잡고 연관 학과 핵심어를 찾는다.
+
+    핵심어 bigram 과 자모 bigram 의 역색인을 들고 있어 조회마다 전체 학과명을 훑지 않는다.
+    점수가 같은 후보는 (학과 수가 많은 순,) 학과명 순으로 정해 해시 시드와 관계없이 같은 결과를 낸다.
+    """
+
+    def __init__(self, index):
+        self.stems = index["stems"]
+        self.counts = index["counts"]
+        self.related = index["related"]
+        self.synonyms = {key: list(terms) for key, terms in SYNONYMS.items()}
+        for key, terms in index.get("llm_synonyms", {}).items():
+            self.synonyms.setdefault(key, [])
+            self.synonyms[key] += [t for t in terms if t not in self.synonyms[key]]
+
+        self.position = {s: i for i, s in enumerate(self.stems)}
+        self.postings = defaultdict(list)
+        for i, s in enumerate(self.stems):
+            for g in bigrams(s):
+                self.postings[g].append(i)
+
+        self.jamo = [jamo(s) for s in self.stems]
+        self.jamo_postings = defaultdict(list)
+        for i, s in enumerate(self.jamo):
+            for g in jamo_bigrams(s):
+                self.jamo_postings[g].append(i)
+
+    def _containing(self, term, limit):
+        matches = [i for i, s in enumerate(self.stems) if term in s]
+        matches.sort(key=lambda i: -self.counts[i])
+        return matches[:limit]
+
+    def _fuzzy(self, query, limit):
+        grams = bigrams(query)
+        overlap = Counter(j for g in grams for j in self.postings.get(g, ()))
+        scored = []
+        for j, n in overlap.items():
+            score = 2 * n / (len(grams) + len(bigrams(self.stems[j])))
+            if score >= 0.5:
+                scored.append((score, j))
+        scored.sort(key=lambda x: (-x[0], self.stems[x[1]]))
+        return scored[:limit]
+
+    def suggest(self, major_input, limit=5):
+        """major_input 과 철자가 비슷한 학과 핵심어 [(핵심어, 유사도 0~1)] (유사도 순). 줄임말은 풀어서 찾는다.
+
+        자모 bigram 색인으로 후보를 좁힌 뒤 자모 편집 거리로 매기므로 색인 크기와 상관없이 수 ms 안에 끝난다.
+        """
+        query = major_stem(major_input)
+        query = ABBREVIATIONS.get(query, query)
+        if not query:
+            return []
+        if query in self.position:
+            return [(query, 1.0)]
+
+        q = jamo(query)
+        overlap = Counter(j for g in jamo_bigrams(q) for j in self.jamo_postings.get(g, ()))
+        # most_common 은 동점을 (집합 순서에 따라 바뀌는) 처음 센 순서로 자르므로 학과명 순으로 정렬해 자른다
+        candidates = sorted(overlap.items(), key=lambda x: (-x[1], self.stems[x[0]]))[:FUZZY_CANDIDATES]
+        scored = []
+        for j, _ in candidates:
+            whole, part = edit_distances(q, self.jamo[j])
+            score = max(1 - whole / max(len(q), len(self.jamo[j])), PARTIAL_WEIGHT * (1 - part / len(q)))
+            scored.append((round(score, 3), j))
+        scored.sort(key=lambda x: (-x[0], -self.counts[x[1]], self.stems[x[1]]))
+        return [(self.stems[j], score) for score, j in scored[:limit]]
+
+    def correct(self, major_input):
+        """검색에 쓸 핵심어. 줄임말은 풀고, 색인에 없는 철자는 충분히 비슷한 학과가 있을 때만 그 학과로 바꾼다."""
+        query = major_stem(major_input)
+        query = ABBREVIATIONS.get(query, query)
+        if not query or query in self.position or any(query in s for s in self.stems):
+            return query
+        candidates = self.suggest(query, limit=1)
+        if candidates and candidates[0][1] >= FUZZY_MIN:
+            return candidates[0][0]
+        return query
+
+    def lookup(self, major_input, limit=TOP_K):
+        """major_input 과 연관된 학과 핵심어 목록. 색인으로 찾을 수 없는 입력이면 빈 리스트."""
+        query = self.correct(major_input)
+        if not query:
+            return []
+
+        scores = {}
+
+        def add(i, score):
+            if score > scores.get(i, 0.0):
+                scores[i] = score
+
+        seeds = self._containing(query, SEED_LIMIT)
+        for i in seeds:
+            add(i, 1.0)
+
+        terms = [t for key, ts in self.synonyms.items() if key in query for t in ts]
+        for term in terms:
+            for i in self._containing(term, TERM_LIMIT):
+                add(i, 0.8)
+
+        if query in self.position:
+            bases = [(1.0, self.position[query])]
+        elif seeds:
+            bases = [(1.0, i) for i in seeds]
+        elif not terms:
+            bases = self._fuzzy(query, SEED_LIMIT)
+            for score, i in bases:
+                add(i, score)
+        else:
+            bases = []
+        for base_score, i in bases:
+            for j, weight in self.related[i]:
+                add(j, 0.9 * base_score * weight)
+
+        excluded = [x for key, xs in EXCLUDE.items() if key in query for x in xs]
+        ranked = sorted(
+            (i for i in scores if not any(x in self.stems[i] for x in excluded)),
+            key=lambda i: (-scores[i], -self.counts[i], self.stems[i]),
+        )
+        return [self.stems[i] for i in ranked[:limit]]
+
+
+def load_index(path=INDEX_PATH):
+    """색인 파일을 프로세스당 한 번만 읽는다. 파일이 없으면 None."""
+    global _index, _index_mtime
+    if not os.path.exists(path):
+        return None
+    mtime = os.stat(path).st_mtime_ns
+    if _index is not None and _index_mtime == mtime:
+        return _index
+
+    with _lock:
+        if _index is None or _index_mtime != mtime:
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != INDEX_VERSION:
+                return None
+            _index, _index_mtime = MajorIndex(index), mtime
+    return _index
+
+
+if __name__ == '__main__':
+    # python -m utils.major_index [--llm 키워드 ...]  (--llm 만 주면 SYNONYMS 의 키워드 전체를 GPT 로 보강)
+    args = sys.argv[1:]
+    keywords = None
+    if args and args[0] == "--llm":
+        keywords = args[1:] or list(SYNONYMS)
+    build_index(enrich_keywords=keywords, api_key=os.environ.get("OPENAI_API_KEY"))
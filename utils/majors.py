@@ -0,0 +1,118 @@
+import hashlib
+import os
+
+from utils import major_index
+from utils.llm import ask_gpt, submit_gpt
+from utils.llm_cache import CACHE_DIR, LLMCache, normalize_text
+
+MAJOR_PROMPT = """
+당신은 한국 대학의 전공 및 학과 연계성 전문가입니다.
+'{major_input}' 전공과 관련된 학과를 다음 기준에 따라 폭넓지만, **학문적 연관성**을 최우선으로 고려하여 제시하세요.
+만약 사용자가 선호 교과목으로 '{major_input}'을(를) 선택했다면, 해당 교과목의 지식이 많이 활용되는 관련 학과도 함께 추천하세요.
+
+선정 기준:
+1. **동일 전공/다른 표현** — 명칭만 다르고 내용이 동일한 학과.
+2. **세부 전공/세부분야** — 해당 전공에서 파생된 세부 연구 분야.
+3. **상위 계열 전공** — 해당 전공을 포함하는 넓은 계열.
+4. **연구·교육 내용상 밀접한 전공** — 주요 교과목, 실험·연구 주제, 산업 응용 분야가 겹치는 전공.
+5. **융합·응용 전공** — 타 분야와 결합하여 새로운 학문 영역을 형성한 전공.
+6. **선호 교과목 연계** - 선호 교과목의 지식이 많이 활용되는 전공을 추가로 추천 (예: 물리 → 기계공학과, 전기전자공학과; 화학 → 신소재공학과, 약학과; 생명과학 → 의예과, 농학과).
+
+**최우선 조건:**
+**- 전공명에 키워드가 포함되어 있더라도, 학문적 연관성이 전혀 없는 학과(예: 물리 → 물리치료학과, 화학 → 문화학과)는 절대 포함하지 마세요.**
+**- 오직 학문적, 교육적 내용이 실제로 밀접하게 연관된 전공만을 엄선하여 제시하세요.**
+
+조건:
+- 반드시 한국 대학에 실존하는 학과명 사용
+- 10~15개 정도 제시
+- 불필요한 설명 없이, 쉼표로 구분
+- 명칭은 정확하게 표기
+
+출력 예시:
+화학과, 응용화학과, 화학공학과, 신소재공학과, 고분자공학과, 나노공학과, 에너지공학과, 환경공학과, 제약학과, 생명화학공학과, 재료공학과, 바이오화학과
+"""
+
+# 프롬프트 문구가 바뀌면 캐시 키도 바뀌어 이전 응답을 재사용하지 않는다
+PROMPT_VERSION = hashlib.sha256(MAJOR_PROMPT.encode()).hexdigest()[:12]
+
+major_cache = LLMCache(os.path.join(CACHE_DIR, "related_majors.sqlite3"))
+
+
+def normalize_major(text):
+    return normalize_text(text)
+
+
+def parse_majors(text):
+    if not text:
+        return []
+    return [m.strip() for m in text.split(',') if m.strip()]
+
+
+def _cache_key(major_input):
+    return f"{PROMPT_VERSION}:{normalize_major(major_input)}"
+
+
+def expand_major(major_input, api_key):
+    """major_input 과 관련된 학과명 목록을 GPT 로 구한다. 같은 입력은 캐시된 결과를 재사용한다."""
+    related = major_cache.get_or_compute(
+        _cache_key(major_input), lambda: parse_majors(ask_gpt(MAJOR_PROMPT.format(major_input=major_input), api_key))
+    )
+    return list(related)
+
+
+def expand_majors(major_inputs, api_key, errors=None):
+    """여러 전공의 expand_major 결과 {입력: 목록}. 캐시에 없는 전공은 GPT 에 한꺼번에 보내 동시에 기다린다.
+
+    errors 에 dict 를 넘기면 재시도 후에도 실패한 전공은 예외를 올리지 않고 {입력: 예외} 로 채워 결과에서 뺀다.
+    """
+    results = {}
+    pending = {}
+    for major_input in dict.fromkeys(major_inputs):
+        cached = major_cache.get(_cache_key(major_input))
+        if cached is not None:
+            major_cache.record("hits")
+            results[major_input] = list(cached)
+        else:
+            major_cache.record("misses")
+            pending[major_input] = submit_gpt(MAJOR_PROMPT.format(major_input=major_input), api_key)
+
+    for major_input, future in pending.items():
+        try:
+            related = parse_majors(future.result())
+        except Exception as e:
+            major_cache.record("errors")
+            if errors is None:
+                raise
+            errors[major_input] = e
+            continue
+        if related:
+            major_cache.set(_cache_key(major_input), related)
+        results[major_input] = related
+    return results
+
+
+def find_related_majors(major_input, api_key, lookup="index", gpt_fallback=False):
+    """관련 학과 목록. lookup="index" 이면 오프라인 색인으로 찾고, 색인에 없는 입력은 gpt_fallback 일 때만 GPT 에 묻는다."""
+    if lookup == "index":
+        index = major_index.load_index()
+        related = index.lookup(major_input) if index is not None else []
+        if related or not gpt_fallback:
+            return related
+    return expand_major(major_input, api_key)
+
+
+def find_related_majors_many(major_inputs, api_key, lookup="index", gpt_fallback=False, errors=None):
+    """여러 전공의 find_related_majors 결과 {입력: 목록}. GPT 에 물어야 하는 전공은 동시에 묻는다 (errors 는 expand_majors)."""
+    related = {}
+    if lookup == "index":
+        index = major_index.load_index()
+        for major_input in dict.fromkeys(major_inputs):
+            related[major_input] = index.lookup(major_input) if index is not None else []
+        if not gpt_fallback:
+            return related
+    missing = [major_input for major_input in major_inputs if not related.get(major_input)]
+    if missing:
+        related.update(expand_majors(missing, api_key, errors))
+        for major_input in errors or ():
+            related.pop(major_input, None)
+    return related
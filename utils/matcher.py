@@ -0,0 +1,88 @@
+from collections import defaultdict
+
+import numpy as np
+
+from utils.data import load_derived
+
+
+class MajorMatcher:
+    """학과명 범주(category) 목록에 대한 부분 문자열 검색기.
+
+    행 단위로 정규식을 돌리는 대신 서로 다른 학과명(수천 개)만 bigram 색인으로 검사하고,
+    결과를 범주 코드로 각 행에 펼친다. 대소문자는 구분하지 않는다.
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.lowered = [str(c).lower() for c in categories]
+
+        postings = defaultdict(list)
+        for i, name in enumerate(self.lowered):
+            for gram in {name[j:j + 2] for j in range(len(name) - 1)}:
+                postings[gram].append(i)
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def extend(self, categories):
+        """categories 가 지금 범주 뒤에 새 학과명을 이어 붙인 것일 때, 새 학과명의 bigram 만 더한 matcher."""
+        if not categories[:len(self.categories)].equals(self.categories):
+            return MajorMatcher(categories)
+        matcher = MajorMatcher.__new__(MajorMatcher)
+        matcher.categories = categories
+        added = [str(c).lower() for c in categories[len(self.categories):]]
+        matcher.lowered = self.lowered + added
+
+        postings = defaultdict(list)
+        for i, name in enumerate(added, start=len(self.lowered)):
+            for gram in {name[j:j + 2] for j in range(len(name) - 1)}:
+                postings[gram].append(i)
+        matcher.postings = dict(self.postings)
+        for gram, ids in postings.items():
+            ids = np.array(ids, dtype=np.int32)
+            matcher.postings[gram] = np.concatenate([self.postings[gram], ids]) if gram in self.postings else ids
+        return matcher
+
+    def _candidates(self, pattern):
+        if len(pattern) < 2:
+            return range(len(self.lowered))
+        lists = []
+        for gram in {pattern[j:j + 2] for j in range(len(pattern) - 1)}:
+            ids = self.postings.get(gram)
+            if ids is None:
+                return ()
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        return candidates
+
+    def match(self, patterns):
+        """patterns 중 하나라도 포함하는 범주이면 True 인 bool 배열 (범주 순서)."""
+        mask = np.zeros(len(self.lowered), dtype=bool)
+        for pattern in {p.lower() for p in patterns if p}:
+            for i in self._candidates(pattern):
+                if not mask[i] and pattern in self.lowered[i]:
+                    mask[i] = True
+        return mask
+
+    def _codes(self, series):
+        categories = series.cat.categories
+        if categories is not self.categories and not categories.equals(self.categories):
+            raise ValueError("학과명 범주가 matcher 를 만든 데이터셋과 다릅니다.")
+        return series.cat.codes.to_numpy()
+
+    def contains(self, series, patterns):
+        """series.str.contains('|'.join(map(re.escape, patterns)), case=False, na=False) 와 같은 행 mask."""
+        codes = self._codes(series)
+        mask = np.append(self.match(patterns), False)
+        return mask[codes]
+
+    def priority(self, series, major_input):
+        """학과명에 major_input 이 들어 있으면 0, 아니면 1."""
+        codes = self._codes(series)
+        hit = np.append(self.match([major_input]), False)
+        return np.where(hit[codes], 0, 1)
+
+
+def load_matcher(name, column='학과명'):
+    return load_derived(name, ('matcher', column), lambda df: MajorMatcher(df[column].cat.categories))
@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MAX_BYTES = int(float(os.environ.get("HIGHAI_RESULT_CACHE_MB", "64")) * 2 ** 20)
+
+
+def _frame_bytes(df):
+    # categorical 열의 categories 는 원본 데이터셋과 공유하므로 codes 만 센다
+    size = df.index.memory_usage(deep=True)
+    for _, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            size += column.cat.codes.nbytes
+        else:
+            size += column.memory_usage(index=False, deep=True)
+    return int(size)
+
+
+def entry_bytes(value):
+    """캐시 항목이 차지하는 메모리 추정치. DataFrame/ndarray 는 실제 크기, 나머지는 sys.getsizeof."""
+    if isinstance(value, pd.DataFrame):
+        return _frame_bytes(value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(entry_bytes(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + sum(entry_bytes(item) for item in vars(value).values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """검색 결과를 프로세스 메모리에 두는 LRU 캐시.
+
+    키는 (데이터셋, 데이터 버전, ...) 튜플이다. 어떤 데이터셋의 새 버전이 처음 보이면 그 데이터셋의 이전 항목을 모두 지우고,
+    전체 크기가 max_bytes 를 넘으면 가장 오래 쓰이지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self, dataset, version):
+        if self._versions.get(dataset, version) != version:
+            stale = [key for key in self._entries if key[0] == dataset]
+            for key in stale:
+                self.size -= self._entries.pop(key)[1]
+            self.stats["invalidations"] += len(stale)
+        self._versions[dataset] = version
+
+    def get(self, key):
+        with self._lock:
+            self._check_version(key[0], key[1])
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key, value):
+        size = entry_bytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(key[0], key[1])
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hit_rate(self):
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+result_cache = ResultCache()
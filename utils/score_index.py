@@ -0,0 +1,136 @@
+import numpy as np
+
+from utils.data import group_codes, load_derived, score_column, score_values
+
+# searchsorted 경계를 살짝 넓힌 뒤 |점수 - 기준| <= 폭 을 정확히 다시 검사한다 (부동소수점 오차 대비)
+_EPSILON = 1e-6
+
+
+def _smallest(values, tiebreak, m):
+    """values 가 작은 순서로 m 번째 값 이하인 원소(동점 포함)의 위치를 (values, tiebreak) 순으로 정렬해 반환."""
+    if m < len(values):
+        threshold = np.partition(values, m - 1)[m - 1]
+        candidates = np.flatnonzero(values <= threshold)
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((tiebreak[candidates], values[candidates]))]
+
+
+class ScoreIndex:
+    """연도별로 합격 점수 순으로 정렬해 둔 행 위치 색인.
+
+    점수 구간 검색은 np.searchsorted 로 자르고, 상위 k 개 선택은 전체 정렬 대신 부분 선택을 쓴다.
+    행 위치는 모두 df 의 위치(iloc) 기준이다.
+    """
+
+    def __init__(self, df, year_col='년도', major_col='학과명'):
+        self.df = df
+        self.year_col = year_col
+        self.major_col = major_col
+        self.score_col = score_column(df)
+        self.scores = score_values(df[self.score_col]).to_numpy()
+        self.major_codes = df[major_col].cat.codes.to_numpy()
+        self._pair_keys = {}
+
+        self.partitions = {}
+        if year_col in df.columns:
+            years = df[year_col].to_numpy()
+            for year in np.unique(years):
+                self.partitions[int(year)] = self._sorted(np.flatnonzero(years == year))
+        self.partitions[None] = self._sorted(np.arange(len(df)))
+
+    def _sorted(self, rows):
+        rows = rows[np.argsort(self.scores[rows], kind='stable')]
+        return rows, self.scores[rows]
+
+    def extend(self, df, start):
+        """df 가 색인한 데이터 뒤에 행을 이어 붙인 것(utils.data.append_results)일 때 새 행(start 부터)을 반영한 색인.
+
+        새 행이 들어간 연도 구획에만 정렬된 새 행을 searchsorted 위치로 끼워 넣는다. 나머지 구획은 그대로 쓴다.
+        """
+        index = ScoreIndex.__new__(ScoreIndex)
+        index.df = df
+        index.year_col, index.major_col, index.score_col = self.year_col, self.major_col, self.score_col
+        index.scores = np.concatenate([self.scores, score_values(df[self.score_col].iloc[start:]).to_numpy()])
+        index.major_codes = df[self.major_col].cat.codes.to_numpy()
+        index._pair_keys = {}
+
+        index.partitions = dict(self.partitions)
+        new_rows = np.arange(start, len(df))
+        groups = [(None, new_rows)]
+        if self.year_col in df.columns:
+            years = df[self.year_col].to_numpy()[start:]
+            groups += [(int(year), new_rows[years == year]) for year in np.unique(years)]
+        for year, rows in groups:
+            rows, scores = index._sorted(rows)
+            old_rows, old_scores = self.partitions.get(year, (np.empty(0, dtype=np.intp), np.empty(0)))
+            # 점수가 같으면 기존 행이 앞선다 (새 행의 위치가 항상 더 크므로 처음부터 만든 색인과 같은 순서)
+            at = np.searchsorted(old_scores, scores, side='right')
+            index.partitions[year] = np.insert(old_rows, at, rows), np.insert(old_scores, at, scores)
+        return index
+
+    def rows(self, year=None):
+        return self.partitions.get(year, (np.empty(0, dtype=np.intp), None))[0]
+
+    def window(self, center, width, year=None):
+        """|점수 - center| <= width 인 행 위치 (점수 순)."""
+        rows, scores = self.partitions.get(year, (np.empty(0, dtype=np.intp), np.empty(0)))
+        lo = np.searchsorted(scores, center - width - _EPSILON, side='left')
+        hi = np.searchsorted(scores, center + width + _EPSILON, side='right')
+        rows = rows[lo:hi]
+        return rows[np.abs(self.scores[rows] - center) <= width]
+
+    def select(self, rows, major_mask):
+        """학과명 범주 mask(MajorMatcher.match 결과)에 해당하는 행만 남긴다."""
+        mask = np.append(major_mask, False)
+        return rows[mask[self.major_codes[rows]]]
+
+    def _pair_key(self, columns):
+        key = self._pair_keys.get(columns)
+        if key is None:
+            key = self._pair_keys[columns] = group_codes(self.df, columns)
+        return key
+
+    def rank(self, rows, priority_mask, center, k, unique=('대학명', '학과명'), order=None):
+        """(우선순위, 점수 차이, 원래 행 순서) 순으로 unique 조합별 첫 행만 골라 상위 k 개를 반환한다.
+
+        priority_mask 에 해당하는 학과명(입력 전공을 포함하는 학과)이 우선순위 0, 나머지는 1.
+        order(rows 와 같은 길이)를 주면 점수 차이 대신 그 값이 작은 순으로 고른다.
+        sort_values(...).drop_duplicates(subset=unique).head(k) 와 같은 결과에 match_priority 와
+        score_diff 열을 붙인 DataFrame.
+        """
+        unique_key = self._pair_key(tuple(unique))
+        priority = np.where(np.append(priority_mask, False)[self.major_codes[rows]], 0, 1)
+        distance = np.abs(self.scores[rows] - center)
+        sort_key = distance if order is None else order
+
+        chosen, seen = [], set()
+        for level in (0, 1):
+            group = np.flatnonzero(priority == level)
+            m = k
+            while True:
+                picked, picked_seen = [], set(seen)
+                for i in group[_smallest(sort_key[group], rows[group], m)]:
+                    key = unique_key[rows[i]]
+                    if key not in picked_seen:
+                        picked_seen.add(key)
+                        picked.append(i)
+                        if len(chosen) + len(picked) == k:
+                            break
+                if len(chosen) + len(picked) >= k or m >= len(group):
+                    break
+                m *= 2
+            chosen += picked
+            seen = picked_seen
+            if len(chosen) >= k:
+                break
+
+        chosen = np.array(chosen, dtype=np.intp)
+        result = self.df.iloc[rows[chosen]].copy()
+        result['match_priority'] = priority[chosen]
+        result['score_diff'] = distance[chosen]
+        return result
+
+
+def load_score_index(name):
+    return load_derived(name, 'score_index', ScoreIndex)
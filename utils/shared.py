@@ -0,0 +1,124 @@
+"""여러 Streamlit(또는 API) 프로세스가 함께 쓰는 데이터셋·색인 묶음.
+
+    python -m utils.shared                 # 모든 데이터셋을 .cache/shared/{name}.bundle 로 발행
+    python -m utils.shared Early_Results1
+
+발행은 한 번만 한다. 데이터셋 DataFrame 과 load_derived 로 만든 검색 색인(matcher, score_index, history_index,
+chance_model, eligibility)을 pickle protocol 5 로 직렬화하되, 큰 numpy 배열은 pickle 밖(out-of-band)에
+64바이트 정렬로 이어 붙여 한 파일에 쓴다. 각 프로세스는 load_results 에서 이 파일을 읽기 전용 mmap 으로 열고
+배열을 복사하지 않고 그대로 가리키므로, 배열 메모리는 OS 페이지 캐시 한 벌을 모든 프로세스가 나눠 쓴다
+(프로세스마다 늘어나는 것은 USS 가 아니라 공유 페이지라서 PSS 로 보면 워커 수로 나뉜다).
+CSV 를 다시 읽거나 색인을 다시 만들 필요가 없어서 새 워커도 바로 준비된다.
+
+묶음은 원본 CSV 의 해시와 pandas/numpy 버전을 함께 기록하며, 하나라도 다르면 쓰지 않고 평소처럼 읽는다.
+pickle 이므로 이 프로그램이 직접 발행한 파일만 읽어야 한다 (.cache 는 배포 서버 로컬 디렉터리).
+"""
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utils.llm_cache import CACHE_DIR
+
+SHARED_DIR = os.environ.get("HIGHAI_SHARED_DIR", os.path.join(CACHE_DIR, "shared"))
+
+# 묶음 형식이 바뀌면 올려서 기존 묶음을 무효화한다
+BUNDLE_VERSION = "1"
+
+_MAGIC = b"HIGHAIB1"
+_HEADER = struct.Struct("<8sQ")
+_ALIGN = 64
+# 이보다 작은 배열은 pickle 안에 그대로 둔다 (학과명 bigram postings 같은 작은 배열이 수만 개라서)
+_MIN_SHARED_BYTES = 4096
+
+
+def bundle_path(name):
+    return os.path.join(SHARED_DIR, f"{name}.bundle")
+
+
+def _runtime():
+    return f"{BUNDLE_VERSION}/pandas {pd.__version__}/numpy {np.__version__}"
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_bundle(path, df, derived, source_hash):
+    """df 와 {load_derived 키: 값} 을 path 에 쓴다."""
+    buffers = []
+
+    def out_of_band(buffer):
+        raw = buffer.raw()
+        if raw.nbytes < _MIN_SHARED_BYTES:
+            return True
+        buffers.append(raw)
+        return False
+
+    payload = pickle.dumps({"df": df, "derived": derived}, protocol=5, buffer_callback=out_of_band)
+
+    # 머리말 다음에 메타데이터(pickle), 그 뒤에 정렬된 배열 버퍼들을 둔다
+    spans, offset = [], 0
+    for raw in buffers:
+        spans.append((offset, raw.nbytes))
+        offset = _aligned(offset + raw.nbytes)
+    meta = pickle.dumps({"runtime": _runtime(), "source_hash": source_hash, "spans": spans, "payload": payload},
+                        protocol=5)
+    start = _aligned(_HEADER.size + len(meta))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(meta)))
+        f.write(meta)
+        for (span_offset, _), raw in zip(spans, buffers):
+            f.seek(start + span_offset)
+            f.write(raw)
+        f.truncate(start + offset)
+    os.replace(tmp_path, path)
+    return start + offset
+
+
+def read_bundle(path, source_hash):
+    """(df, {키: 값}) 을 mmap 위에 올린다. 묶음이 없거나 원본 해시·실행 환경이 다르면 None.
+
+    배열은 읽기 전용이며 파일을 다시 발행해도(os.replace) 이미 연 프로세스는 이전 파일을 계속 가리킨다.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        magic, meta_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            return None
+        meta = pickle.loads(f.read(meta_size))
+        if meta["runtime"] != _runtime() or meta["source_hash"] != source_hash:
+            return None
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    start = _aligned(_HEADER.size + meta_size)
+    buffers = [view[start + offset:start + offset + size] for offset, size in meta["spans"]]
+    bundle = pickle.loads(meta["payload"], buffers=buffers)
+    return bundle["df"], bundle["derived"]
+
+
+def publish(names=None):
+    """데이터셋마다 모든 전형 색인을 만들어 묶음으로 발행한다."""
+    from utils import admissions, data, snapshot
+
+    names = names or data.DATASETS
+    tracks = [track for track, config in admissions.TRACKS.items() if config["dataset"] in names]
+    admissions.warm_up(tracks)
+    for name in names:
+        df = data.load_results(name)
+        derived = data.derived_for(name)
+        size = write_bundle(bundle_path(name), df, derived, snapshot.file_hash(data.data_path(name)))
+        print(f"{name}: {len(df)} rows, {len(derived)} indexes, {size / 2 ** 20:.1f}MB -> {bundle_path(name)}")
+
+
+if __name__ == '__main__':
+    publish(sys.argv[1:])
@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+import pyarrow as pa
+
+# 스냅샷에 저장되는 DataFrame 형식(utils.data.read_results)이 바뀌면 올려서 기존 스냅샷을 무효화한다
+SNAPSHOT_VERSION = "1"
+
+_VERSION_KEY = b"highai.snapshot_version"
+_HASH_KEY = b"highai.source_sha256"
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def write_snapshot(path, df, source_hash):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_VERSION_KEY] = SNAPSHOT_VERSION.encode()
+    metadata[_HASH_KEY] = source_hash.encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path, source_hash):
+    """Arrow IPC 스냅샷을 memory-map 으로 읽는다. 없거나 버전/원본 해시가 다르면 None."""
+    if not os.path.exists(path):
+        return None
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        metadata = reader.schema.metadata or {}
+        if metadata.get(_VERSION_KEY) != SNAPSHOT_VERSION.encode():
+            return None
+        if metadata.get(_HASH_KEY) != source_hash.encode():
+            return None
+        return reader.read_all().to_pandas()
@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+from utils.llm_cache import CACHE_DIR
+
+LOG_PATH = os.environ.get("HIGHAI_REQUEST_LOG", os.path.join(CACHE_DIR, "request_log.jsonl"))
+# 로그 파일이 이 크기를 넘으면 .1 로 옮기고 새로 쓴다 (요약 페이지는 두 파일을 함께 읽는다)
+LOG_MAX_BYTES = 20 * 2 ** 20
+
+# stream_chat 의 stats 중 로그에 남길 항목
+LLM_FIELDS = ("ttft", "total_time", "prompt_tokens", "completion_tokens", "total_tokens")
+
+_write_lock = threading.Lock()
+
+
+class Trace:
+    """요청 하나의 단계별 소요 시간과 부가 정보를 모아 JSON 한 줄로 남긴다.
+
+        with Trace("교과", enabled=True) as trace:
+            with trace.stage("expand"):
+                ...
+            trace.set(results=len(results))
+
+    같은 이름의 단계를 여러 번 재면 시간을 더한다. 여러 스레드에서 함께 써도 된다.
+    with 블록을 벗어날 때 로그를 쓰며, 예외로 끝나면 status 에 예외 이름을 남긴다.
+
+    로그는 enabled 일 때만 쓴다. 사용자가 입력한 값(희망 전공, 성적, 지원자격, 과목·주제)은 fields 로 넘기지 말고
+    시간·상태·개수만 남긴다 (개인정보 처리방침상 입력 데이터를 저장하지 않는다).
+    """
+
+    def __init__(self, page, enabled=False, path=LOG_PATH, **fields):
+        self.page = page
+        self.enabled = enabled
+        self.path = path
+        self.fields = fields
+        self.stages = {}
+        self.llm = {}
+        self.status = "ok"
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def scoped(self, prefix):
+        """단계 이름 앞에 prefix 를 붙여 기록하는 trace (전형별 동시 검색 등)."""
+        return _Scoped(self, prefix)
+
+    def set(self, **fields):
+        with self._lock:
+            self.fields.update(fields)
+
+    def record_llm(self, stats, prefix=""):
+        """stream_chat 이 채운 stats 에서 첫 토큰 시간, 전체 시간, 토큰 수를 옮긴다."""
+        with self._lock:
+            for name in LLM_FIELDS:
+                if name in stats:
+                    value = stats[name]
+                    self.llm[prefix + name] = round(value * 1000, 1) if name.endswith(("ttft", "time")) else value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and self.status == "ok":
+            self.status = exc_type.__name__
+        self.write()
+        return False
+
+    def record(self):
+        return {
+            "ts": time.time(),
+            "page": self.page,
+            "status": self.status,
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 1),
+            "stages": {name: round(ms, 1) for name, ms in self.stages.items()},
+            "llm": self.llm,
+            **self.fields,
+        }
+
+    def write(self):
+        if not self.enabled:
+            return
+        line = json.dumps(self.record(), ensure_ascii=False, default=str) + "\n"
+        try:
+            with _write_lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) > LOG_MAX_BYTES:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            # 로그를 못 쓰더라도 요청 처리에는 영향이 없어야 한다
+            pass
+
+
+class _Scoped:
+    def __init__(self, trace, prefix):
+        self.trace = trace
+        self.prefix = prefix
+
+    def stage(self, name):
+        return self.trace.stage(self.prefix + name)
+
+    def scoped(self, prefix):
+        return _Scoped(self.trace, self.prefix + prefix)
+
+    def set(self, **fields):
+        self.trace.set(**{self.prefix + name: value for name, value in fields.items()})
+
+    def record_llm(self, stats, prefix=""):
+        self.trace.record_llm(stats, self.prefix + prefix)
+
+
+class _NoTrace:
+    """trace 를 넘기지 않았을 때 쓰는 아무것도 하지 않는 trace."""
+
+    def stage(self, name):
+        return nullcontext()
+
+    def scoped(self, prefix):
+        return self
+
+    def set(self, **fields):
+        pass
+
+    def record_llm(self, stats, prefix=""):
+        pass
+
+
+NO_TRACE = _NoTrace()
+
+
+def read_log(path=LOG_PATH):
+    """로그(회전된 .1 포함)를 DataFrame 으로. stages/llm 은 'stages.filter', 'llm.ttft' 같은 열로 펼친다."""
+    records = []
+    for name in (path + ".1", path):
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    if not records:
+        return pd.DataFrame(columns=["ts", "page", "status", "total_ms"])
+    df = pd.json_normalize(records)
+    df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True).dt.tz_convert("Asia/Seoul")
+    return df
+
+
+def _percentiles(values):
+    values = values.dropna()
+    return pd.Series({
+        "requests": len(values),
+        "p50": values.quantile(0.5),
+        "p95": values.quantile(0.95),
+        "p99": values.quantile(0.99),
+        "max": values.max(),
+    })
+
+
+def latency_summary(df):
+    """페이지별 전체 소요 시간(ms) 백분위."""
+    return df.groupby("page")["total_ms"].apply(_percentiles).unstack()
+
+
+def stage_summary(df):
+    """페이지·단계별 소요 시간(ms) 백분위. LLM 의 첫 토큰 시간과 전체 시간도 단계처럼 함께 보여준다."""
+    columns = [c for c in df.columns
+               if c.startswith("stages.") or (c.startswith("llm.") and c.endswith(("ttft", "total_time")))]
+    if not columns:
+        return pd.DataFrame()
+    long = df.melt(id_vars="page", value_vars=columns, var_name="stage", value_name="ms").dropna(subset=["ms"])
+    long["stage"] = long["stage"].str.split(".", n=1).str[1]
+    return long.groupby(["page", "stage"])["ms"].apply(_percentiles).unstack()
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import re
+
+from utils.llm_cache import CACHE_DIR, LLMCache, normalize_text
+
+TOPIC_PROMPT = """
+당신은 진로진학 전문 고등학교 교사입니다. 학생이 입력한 교과목과 주제, 학년, 선호 탐구 방법에 기반하여, **대학 전공 수준의 심화 탐구 주제 10가지를 구체적으로 제시해주세요.**
+
+각 주제는 다음의 3가지 구성요소를 포함해야 합니다:
+
+1. **주제명** (문장형 제목)
+2. **핵심 개념**: 해당 주제와 관련된 교과 개념 및 전공 개념
+3. **탐구 방법**: 학생의 선호 탐구 방식{method}에 맞추어, 탐구의 구체적인 실행 절차를 친절하고 상세하게 안내해주세요.
+
+**학생 정보:**
+- 학년: {grade}학년
+- 좋아하는 교과목: {subject}
+- 좋아하는 주제(단원): {topic}
+- 선호하는 탐구 방법: {method}
+
+**답변 형식 예시:**
+1. **[주제명]**
+   - 핵심 개념: ...
+   - 탐구 방법: ...
+
+※ 현실적으로 수행 가능한 고등학생 수준의 탐구를 기반으로, 교육과정 및 대입 전형에서 활용 가능한 방식으로 제안해주세요.
+※ 고등학생들이 해당 탐구를 실제로 할 수 있도록 공식적인 학술 용어를 활용하고 구체적으로 이해하기 쉽게 설명해주세요.
+※ 핵심 개념은 5개 이상, 탐구 방법은 4문장 이상으로 내용을 구체적으로 설명해주세요.
+"""
+
+# 프롬프트가 요청하는 주제 수
+TOPIC_COUNT = 10
+
+# 프롬프트 문구가 바뀌면 캐시 키도 바뀌어 이전 응답을 재사용하지 않는다
+PROMPT_VERSION = hashlib.sha256(TOPIC_PROMPT.encode()).hexdigest()[:12]
+
+topic_cache = LLMCache(os.path.join(CACHE_DIR, "research_topics.sqlite3"), ttl=7 * 24 * 3600, max_entries=2000)
+
+# "1. **제목**", "### 2) [제목]", "**3. 주제명: 제목**" 등. 주제 번호는 줄 맨 앞에만 온다
+# (탐구 방법 안의 "  1. 수초를 준비합니다." 같은 들여쓴 단계는 주제가 아니다)
+_HEADING = re.compile(r"^(?P<hash>#+\s*)?(?P<stars>\*+\s*)?(?P<number>\d{1,2})\s*[.)]\s*(?P<title>.+?)\s*$")
+# "- 핵심 개념: ...", "* **탐구 방법**: ...", "• 탐구방법 : ..." 등
+_FIELD = re.compile(r"^\s*(?:[-*•·]\s*)?\**\s*(핵심\s*개념|탐구\s*방법)\s*\**\s*[:：]\s*\**\s*(.*?)\s*$")
+_TITLE_LABEL = re.compile(r"^(?:주제\s*명?\s*[:：]\s*)")
+# 마지막 주제 뒤에 붙는 안내 문구 등은 탐구 방법에 이어 붙이지 않는다
+_TERMINATOR = re.compile(r"^\s*(?:※|---|___|\*\*\*)")
+
+
+def _clean_title(text):
+    text = text.strip().strip("*").strip()
+    text = _TITLE_LABEL.sub("", text)
+    if text.startswith("[") and text.endswith("]"):
+        text = text[1:-1]
+    return text.strip().strip("*").strip()
+
+
+class TopicParser:
+    """스트리밍으로 들어오는 탐구 주제 응답을 주제 단위로 잘라낸다.
+
+    feed() 에 받은 텍스트 조각을 넣으면 다음 주제 번호가 시작되어 완성된 주제들을
+    (주제명, 핵심 개념, 탐구 방법) 튜플로 반환한다. 응답이 끝나거나 끊기면 close() 로 남은 주제를 꺼낸다.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.text = ""
+        self.current = None
+        self.field = None
+        self.number = 0
+
+    def _flush(self):
+        topic, self.current, self.field = self.current, None, None
+        if topic and topic["title"] and (topic["핵심 개념"] or topic["탐구 방법"]):
+            return [(topic["title"], "\n".join(topic["핵심 개념"]).strip(), "\n".join(topic["탐구 방법"]).strip())]
+        return []
+
+    def _is_topic(self, heading):
+        """번호 줄이 새 주제의 시작인지. 항목을 읽는 중에는 들여쓰지 않은 단계 번호("1. ...", "2. ...")와 구분하려고
+        제목 표시(#, **, [)가 있고 바로 다음 번호인 줄만 주제로 본다."""
+        number = int(heading.group("number"))
+        if self.field is None:
+            return number > self.number
+        marked = heading.group("hash") or heading.group("stars") or heading.group("title").startswith(("**", "["))
+        return bool(marked) and number == self.number + 1
+
+    def _line(self, line):
+        field = _FIELD.match(line)
+        if field:
+            if self.current is not None:
+                self.field = "핵심 개념" if field.group(1).startswith("핵심") else "탐구 방법"
+                self.current[self.field].append(field.group(2))
+            return []
+
+        heading = _HEADING.match(line)
+        if heading and self._is_topic(heading):
+            self.number = int(heading.group("number"))
+            done = self._flush()
+            self.current = {"title": _clean_title(heading.group("title")), "핵심 개념": [], "탐구 방법": []}
+            return done
+
+        if _TERMINATOR.match(line):
+            self.field = None
+        elif self.field is not None and line.strip():
+            self.current[self.field].append(line.strip())
+        return []
+
+    def feed(self, chunk):
+        self.text += chunk
+        self.buffer += chunk
+        *lines, self.buffer = self.buffer.split("\n")
+        done = []
+        for line in lines:
+            done += self._line(line)
+        return done
+
+    def close(self):
+        done = self._line(self.buffer) if self.buffer else []
+        self.buffer = ""
+        return done + self._flush()
+
+
+def parse_topics(text):
+    parser = TopicParser()
+    return parser.feed(text) + parser.close()
+
+
+def topic_key(subject, topic, grade, method):
+    return ":".join([PROMPT_VERSION] + [normalize_text(v) for v in (subject, topic, grade, method)])
+
+
+def cached_topics(key):
+    """저장된 (주제명, 핵심 개념, 탐구 방법) 목록. 없거나 만료되었으면 None."""
+    topics = topic_cache.get(key)
+    topic_cache.record("misses" if topics is None else "hits")
+    return None if topics is None else [tuple(t) for t in topics]
+
+
+def is_complete(topics):
+    """요청한 수만큼의 주제가 모두 주제명·핵심 개념·탐구 방법을 갖췄는지."""
+    return len(topics) == TOPIC_COUNT and all(all(field.strip() for field in topic) for topic in topics)
+
+
+def store_topics(key, topics):
+    """완전한 결과만 저장한다. 덜 받았거나 빈 항목이 있는 결과는 다시 보여주지 않도록 저장하지 않고 False."""
+    if not is_complete(topics):
+        return False
+    topic_cache.set(key, [list(t) for t in topics])
+    return True